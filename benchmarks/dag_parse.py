@@ -0,0 +1,293 @@
+"""
+DAG-parse benchmark of the DAG factory.
+
+Generates synthetic dlt and dbt configs (see `synthetic.py`) and measures, for every config count,
+the time spent reading, parsing (YAML), validating (pydantic) and building the DAGs, full
+`DagGenerator.create_dags` runs without and with the compiled snapshot, cold runs compiling with
+`--parallelism` worker processes, from a regular and from a daemonic process (as in the DAG
+processor, where the factory compiles sequentially), and the peak RSS. Each
+count runs in a fresh interpreter. Airflow Variables are resolved from a static resolver and dbt
+DAGs are rendered from a synthetic project manifest, so no metadata DB, dbt or network is needed,
+only the Python dependencies of the DAGs.
+
+    python benchmarks/dag_parse.py
+    python benchmarks/dag_parse.py --configs 100 500 1000 --output results.json --no-baseline
+    python benchmarks/dag_parse.py --save-baseline benchmarks/baseline.json
+
+Results are compared against `benchmarks/baseline.json` unless `--no-baseline` is given: the
+command exits with status 1 when a timing is slower than the baseline by more than the tolerance or
+the peak RSS grew by more than the tolerance. A missing baseline, or a measured config count it does
+not cover, only prints a warning unless `--require-baseline` is given. The baseline is recorded on
+the CI runner (see the `Benchmark` workflow), timings of other machines are not comparable.
+"""
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from functools import partial
+from types import SimpleNamespace
+from typing import Callable, Dict, List
+
+BENCHMARKS_PATH = os.path.dirname(os.path.abspath(__file__))
+REPO_PATH = os.path.dirname(BENCHMARKS_PATH)
+DAGS_PATH = os.path.join(REPO_PATH, 'dags')
+
+# Timings under this many seconds are not compared, they are dominated by noise
+MIN_COMPARED_SECONDS = 0.05
+
+DEFAULT_BASELINE_PATH = os.path.join(BENCHMARKS_PATH, 'baseline.json')
+
+
+@contextlib.contextmanager
+def timed(stages: Dict[str, float], stage: str):
+    """Add the time spent in the block to a stage."""
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        stages[stage] += time.perf_counter() - started_at
+
+
+def _create_dags_timed(new_generator: Callable, config_dir: str, dlt_tasks: Dict, durations):
+    """Run `create_dags` with a new generator and put its duration in seconds into the queue."""
+    started_at = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        new_generator().create_dags(config_dir, None, dlt_tasks)
+    durations.put(time.perf_counter() - started_at)
+
+
+def run_worker(workdir: str, configs: int, dbt_share: float, groups: int, parallelism: int, options: Dict) -> Dict:
+    """Measure one config count in the current interpreter, which must be a fresh one."""
+    os.environ['DAG_FACTORY_CACHE_PATH'] = os.path.join(workdir, 'cache')
+    os.environ['DLT_DATA_DIR'] = os.path.join(workdir, 'dlt')
+    sys.path[:0] = [DAGS_PATH, BENCHMARKS_PATH]
+
+    # pylint: disable=C0415
+    import synthetic
+    from dag_factory.common import constants
+    from dag_factory.common.dbt_manifest import stamp_manifest
+    from dag_factory.common.registry import LazyRegistry
+    from dag_factory.common.variables import MODEL_VARIABLES, VariableResolver
+    from dag_factory.common.yaml_loader import load_yaml
+    from dag_factory.dag_runner import DagGenerator, validate_config
+
+    class StaticResolver(VariableResolver):
+        """Resolves the Variables from fixed values instead of the metadata DB."""
+
+        def __init__(self, variables: Dict):
+            self.variables = variables
+
+        def get_many(self, names: List[str]) -> Dict:
+            return {name: self.variables[name] for name in names if name in self.variables}
+
+    dbt_dags = int(configs * dbt_share)
+    config_dir = os.path.join(workdir, 'pipeline_configs')
+    project_path = os.path.join(workdir, 'dbt')
+    synthetic.generate_config_tree(config_dir, configs - dbt_dags, dbt_dags, groups, **options)
+    synthetic.generate_dbt_project(project_path, groups)
+    stamp_manifest(project_path)
+
+    factory_constants = SimpleNamespace(**{
+        **{name: getattr(constants, name) for name in dir(constants) if name.isupper()},
+        "ENV": "prod",
+        "DBT_PROJECT_PATH": project_path,
+        "DBT_PROFILES_PATH": os.path.join(project_path, 'profiles.yml'),
+    })
+    resolver = StaticResolver({**MODEL_VARIABLES, "env": "prod"})
+    dlt_tasks = {synthetic.SYNTHETIC_DAG_TYPE: LazyRegistry({
+        name: f"synthetic_sources:{name}" for name in synthetic.SYNTHETIC_SOURCES
+    })}
+
+    def new_generator(snapshot: str = 'dag_snapshot.pickle', **options) -> DagGenerator:
+        generator_constants = SimpleNamespace(**{
+            **vars(factory_constants), "DAG_SNAPSHOT_PATH": os.path.join(workdir, 'cache', snapshot),
+        })
+        return DagGenerator(constants=generator_constants, on_failure="NOT_IGNORE", resolver=resolver, **options)
+
+    stages = defaultdict(float)
+    file_paths = sorted(
+        os.path.join(root, file) for root, _, files in os.walk(config_dir) for file in files
+    )
+
+    contents = []
+    with timed(stages, 'read'):
+        for file_path in file_paths:
+            with open(file_path, 'rb') as f:
+                contents.append(f.read())
+
+    with timed(stages, 'yaml'):
+        documents = [load_yaml(content) for content in contents]
+
+    variables = resolver.resolve(MODEL_VARIABLES)
+    configs_by_id = {}
+    with timed(stages, 'validate'):
+        for document in documents:
+            configs_by_id.update(validate_config(document, variables))
+
+    generator = new_generator()
+    kwargs = generator.builder_kwargs(dlt_tasks, config_dir)
+    tasks = 0
+    for config in configs_by_id.values():
+        with timed(stages, f'build_{config.tool}'):
+            dag = generator.dags_mapping[config.tool](pipeline_config=config, **kwargs)
+        tasks += len(dag.tasks)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        with timed(stages, 'create_dags_cold'):
+            new_generator().create_dags(config_dir, None, dlt_tasks)
+        with timed(stages, 'create_dags_warm'):
+            new_generator().create_dags(config_dir, None, dlt_tasks)
+        with timed(stages, 'create_dags_parallel'):
+            new_generator('parallel.pickle', parallelism=parallelism).create_dags(config_dir, None, dlt_tasks)
+
+    # Timed inside the daemonic process, the fork itself is not part of the parse
+    durations = multiprocessing.get_context('fork').SimpleQueue()
+    daemonic = multiprocessing.get_context('fork').Process(
+        target=_create_dags_timed,
+        args=(partial(new_generator, 'daemonic.pickle', parallelism=parallelism), config_dir, dlt_tasks, durations),
+        daemon=True,
+    )
+    daemonic.start()
+    daemonic.join()
+    if daemonic.exitcode != 0:
+        raise RuntimeError(f"Daemonic create_dags failed with exit code {daemonic.exitcode}")
+    stages['create_dags_daemonic'] += durations.get()
+
+    return {
+        "configs": configs,
+        "dlt_dags": configs - dbt_dags,
+        "dbt_dags": dbt_dags,
+        "tasks": tasks,
+        "stages": dict(stages),
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def measure(configs: int, args) -> Dict:
+    """Run the worker of a config count in fresh interpreters and keep the best of the repeats."""
+    runs = []
+    for _ in range(args.repeat):
+        result = subprocess.run(
+            [sys.executable, __file__, '--worker', str(configs), '--dbt-share', str(args.dbt_share),
+             '--groups', str(args.groups), '--parallelism', str(args.parallelism), '--max-transformers', str(args.max_transformers),
+             '--max-depends-on', str(args.max_depends_on), '--max-tasks', str(args.max_tasks),
+             '--max-resources', str(args.max_resources)],
+            capture_output=True, text=True, check=False,
+        )
+        if result.returncode != 0:
+            sys.stderr.write(result.stderr[-4000:])
+            raise SystemExit(f"Benchmark of {configs} configs failed with exit code {result.returncode}")
+        runs.append(json.loads(result.stdout.strip().splitlines()[-1]))
+
+    best = dict(runs[0])
+    best["stages"] = {stage: min(run["stages"][stage] for run in runs) for stage in runs[0]["stages"]}
+    best["peak_rss_mb"] = min(run["peak_rss_mb"] for run in runs)
+    return best
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float) -> List[str]:
+    """Return the regressions of the results against a baseline."""
+    regressions = []
+    for configs, result in results.items():
+        expected = baseline.get(configs)
+        if expected is None:
+            continue
+        for stage, seconds in result["stages"].items():
+            baseline_seconds = expected["stages"].get(stage)
+            if baseline_seconds is None or max(seconds, baseline_seconds) < MIN_COMPARED_SECONDS:
+                continue
+            if seconds > baseline_seconds * (1 + tolerance):
+                regressions.append(f"{configs} configs: {stage} took {seconds:.3f}s, baseline {baseline_seconds:.3f}s")
+        if result["peak_rss_mb"] > expected["peak_rss_mb"] * (1 + tolerance):
+            regressions.append(
+                f"{configs} configs: peak RSS {result['peak_rss_mb']:.0f} MB, baseline {expected['peak_rss_mb']:.0f} MB"
+            )
+    return regressions
+
+
+def print_results(results: Dict[str, Dict]):
+    for configs, result in results.items():
+        print(f"{configs} configs ({result['dlt_dags']} dlt, {result['dbt_dags']} dbt, {result['tasks']} tasks), "
+              f"peak RSS {result['peak_rss_mb']:.0f} MB")
+        for stage, seconds in result["stages"].items():
+            print(f"  {stage:<20} {seconds * 1000:>10.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--configs', type=int, nargs='+', default=[100, 500], help='Config counts to measure.')
+    parser.add_argument('--dbt-share', type=float, default=0.3, help='Share of dbt DAGs among the configs.')
+    parser.add_argument('--groups', type=int, default=10, help='Number of dbt tag groups.')
+    parser.add_argument('--parallelism', type=int, default=4, help='Workers of the parallel create_dags runs.')
+    parser.add_argument('--max-transformers', type=int, default=3)
+    parser.add_argument('--max-depends-on', type=int, default=3)
+    parser.add_argument('--max-tasks', type=int, default=3)
+    parser.add_argument('--max-resources', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per config count, the best one is kept.')
+    parser.add_argument('--output', help='Write the results as JSON to this file.')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE_PATH,
+                        help='Fail on regressions against the results stored in this file (default: %(default)s).')
+    parser.add_argument('--no-baseline', dest='baseline', action='store_const', const=None,
+                        help='Only measure, without comparing against a baseline.')
+    parser.add_argument('--require-baseline', action='store_true',
+                        help='Fail when the baseline is missing or does not cover a measured config count.')
+    parser.add_argument('--save-baseline', help='Store the results as the baseline in this file.')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed relative regression.')
+    parser.add_argument('--worker', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        options = {
+            "max_transformers": args.max_transformers, "max_depends_on": args.max_depends_on,
+            "max_tasks": args.max_tasks, "max_resources": args.max_resources,
+        }
+        with tempfile.TemporaryDirectory(prefix='dag_parse-') as workdir, contextlib.redirect_stdout(sys.stderr):
+            result = run_worker(workdir, args.worker, args.dbt_share, args.groups, args.parallelism, options)
+        print(json.dumps(result))
+        return
+
+    if args.save_baseline:
+        args.baseline = None
+    if args.baseline and not os.path.exists(args.baseline):
+        message = f"Baseline {args.baseline} not found, record one with --save-baseline"
+        if args.require_baseline:
+            raise SystemExit(message)
+        print(f"Warning: {message}, only measuring.", file=sys.stderr)
+        args.baseline = None
+
+    results = {str(configs): measure(configs, args) for configs in args.configs}
+    print_results(results)
+
+    for path in filter(None, [args.output, args.save_baseline]):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        uncovered = [configs for configs in results if configs not in baseline]
+        if uncovered:
+            message = f"no baseline for {', '.join(uncovered)} configs, record one with --save-baseline"
+            if args.require_baseline:
+                regressions.append(message)
+            else:
+                print(f"Warning: {message}.", file=sys.stderr)
+        if regressions:
+            print("\nRegressions against the baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("\nNo regression against the baseline.")
+
+
+if __name__ == '__main__':
+    main()
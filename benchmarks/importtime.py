@@ -0,0 +1,98 @@
+"""
+Import-time report of the DAG factory entry point.
+
+Runs `generate_dags.py` in a fresh interpreter with `-X importtime`, the way a task process
+imports it, and summarizes the slowest modules and top-level packages:
+
+    python benchmarks/importtime.py                      # scheduler-style parse
+    python benchmarks/importtime.py --dag-id dbt_gold    # `airflow tasks run dbt_gold ...`
+    python benchmarks/importtime.py --json               # machine-readable output
+
+It needs the Airflow environment the DAGs run in.
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+REPO_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DAGS_PATH = os.path.join(REPO_PATH, 'dags')
+
+IMPORT_TIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$')
+
+
+def run_importtime(dag_id: Optional[str], statement: str) -> str:
+    """Run the statement with `-X importtime` and return the interpreter's report."""
+    argv = ['airflow', 'tasks', 'run', dag_id] if dag_id else ['airflow', 'dags', 'list']
+    code = f"import sys; sys.argv = {argv!r}; {statement}"
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join(filter(None, [DAGS_PATH, os.getenv('PYTHONPATH')]))}
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=DAGS_PATH, env=env, capture_output=True, text=True, check=False,
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr[-4000:])
+        raise SystemExit(f"Importing failed with exit code {result.returncode}")
+    return result.stderr
+
+
+def parse_report(report: str) -> List[Dict]:
+    """Parse the `-X importtime` lines into modules with their self and cumulative times in microseconds."""
+    modules = []
+    for line in report.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            modules.append({
+                'module': module,
+                'self_us': int(self_us),
+                'cumulative_us': int(cumulative_us),
+                'depth': len(indent) // 2,
+            })
+    return modules
+
+
+def summarize(modules: List[Dict], top: int) -> Dict:
+    """Aggregate the self times by top-level package and keep the slowest modules."""
+    packages = defaultdict(int)
+    for module in modules:
+        packages[module['module'].split('.')[0]] += module['self_us']
+    return {
+        'total_us': sum(module['self_us'] for module in modules),
+        'modules_count': len(modules),
+        'packages': dict(sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]),
+        'slowest_modules': sorted(modules, key=lambda module: module['cumulative_us'], reverse=True)[:top],
+    }
+
+
+def print_summary(summary: Dict):
+    print(f"{summary['modules_count']} modules imported in {summary['total_us'] / 1000:.1f} ms")
+    print("\nSelf time by top-level package:")
+    for package, self_us in summary['packages'].items():
+        print(f"  {package:<40} {self_us / 1000:>9.1f} ms")
+    print("\nSlowest imports (cumulative):")
+    for module in summary['slowest_modules']:
+        print(f"  {module['module']:<60} {module['cumulative_us'] / 1000:>9.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dag-id', help='Import as the task process of this DAG.')
+    parser.add_argument('--statement', default='import generate_dags', help='Statement to profile.')
+    parser.add_argument('--top', type=int, default=25, help='Number of packages and modules reported.')
+    parser.add_argument('--json', action='store_true', help='Print the summary as JSON.')
+    args = parser.parse_args()
+
+    summary = summarize(parse_report(run_importtime(args.dag_id, args.statement)), args.top)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_summary(summary)
+
+
+if __name__ == '__main__':
+    main()
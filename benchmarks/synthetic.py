@@ -0,0 +1,158 @@
+"""
+Synthetic DAG factory configurations for the benchmarks.
+
+Generates config trees shaped like `dags/pipeline_configs`, with dlt DAGs of varying
+transformers (some in fan-out mode), depends_on fans and task counts, dbt DAGs selecting tag
+groups, and a dbt project with a stamped manifest so dbt DAGs render without dbt. Only depends
+on PyYAML.
+"""
+import json
+import os
+from typing import Dict, Optional
+
+import yaml
+
+SYNTHETIC_DAG_TYPE = 'synthetic'
+SYNTHETIC_SOURCES = ['synthetic_source_a', 'synthetic_source_b', 'synthetic_source_c']
+DECOMPOSE_MODES = ['none', 'serial', 'parallel', 'parallel-isolated', 'auto']
+COLUMNS = [
+    "event_date", "event_timestamp", "event_name", "event_params", "user_id", "user_pseudo_id",
+    "user_first_touch_timestamp", "user_ltv", "device", "geo", "traffic_source", "platform",
+    "ecommerce", "items",
+]
+
+
+def _depends_on(index: int, prefix: str, fan: int) -> Optional[Dict]:
+    if not fan or index < 1:
+        return None
+    return {
+        f"{prefix}_{upstream}": {"task_id": "end", "timeout": 120, "deferrable": upstream % 2 == 0}
+        for upstream in range(max(index - fan, 0), index)
+    }
+
+
+def dlt_config(index: int, max_transformers: int = 3, max_depends_on: int = 3, max_tasks: int = 3,
+               max_resources: int = 4) -> Dict:
+    """Return the config file content of a synthetic dlt DAG."""
+    transformers_count = index % (max_transformers + 1)
+    dag = {
+        "dag_config": {
+            "description": f"Synthetic DAG {index} pulling data from a source.",
+            "tags": ["ingest", "dlt", SYNTHETIC_DAG_TYPE],
+            "schedule": f"{index % 60} {index % 24} * * *",
+        },
+        "tool": "dlt",
+        "outlet": index % 2 == 0,
+        "dag_type": SYNTHETIC_DAG_TYPE,
+        "pipeline": {
+            "pipeline_name": f"synthetic_{index}",
+            "destination_name": f"bronze_synthetic_{index}",
+            "tasks": [
+                {
+                    "source": SYNTHETIC_SOURCES[task],
+                    "run_parameters": {
+                        "retries": index % 4,
+                        "decompose": DECOMPOSE_MODES[(index + task) % len(DECOMPOSE_MODES)],
+                    },
+                    "source_parameters": {
+                        "resources": 1 + (index + task) % max_resources,
+                        "columns": COLUMNS[:4 + index % (len(COLUMNS) - 3)],
+                    },
+                }
+                for task in range(1 + index % min(max_tasks, len(SYNTHETIC_SOURCES)))
+            ],
+        },
+    }
+    depends_on = _depends_on(index, "synthetic_dlt", index % (max_depends_on + 1))
+    if depends_on:
+        dag["depends_on"] = depends_on
+    if transformers_count:
+        if index % 3 == 0:
+            dag["pipeline"]["fan_out"] = {"bucket_url": f"gs://synthetic-staging/{index}"}
+        dag["transformers"] = {
+            f"transformer_{transformer}": {"name": f"stream_{transformer}", "outlet": transformer % 2 == 0}
+            for transformer in range(transformers_count)
+        }
+    return {"dags": {f"synthetic_dlt_{index}": dag}}
+
+
+def dbt_config(index: int, groups: int, max_depends_on: int = 3) -> Dict:
+    """Return the config file content of a synthetic dbt DAG selecting one tag group."""
+    dag = {
+        "dag_config": {
+            "tags": ["transform", "dbt", f"group_{index % groups}"],
+            "schedule": [f"bigquery://synthetic_dlt_{index}"],
+        },
+        "tool": "dbt",
+        "outlet": True,
+    }
+    depends_on = _depends_on(index, "synthetic_dbt", index % (max_depends_on + 1))
+    if depends_on:
+        dag["depends_on"] = depends_on
+    return {"dags": {f"synthetic_dbt_{index}": dag}}
+
+
+def generate_config_tree(config_dir: str, dlt_dags: int, dbt_dags: int = 0, groups: int = 10, **dlt_options):
+    """
+    Write one config file per DAG, spread over ingest and transform subdirectories.
+
+    Args:
+        config_dir (str): Destination directory.
+        dlt_dags (int): Number of dlt DAGs.
+        dbt_dags (int): Number of dbt DAGs.
+        groups (int): Number of dbt tag groups.
+        dlt_options: Options of `dlt_config`.
+    """
+    for kind, count in (("ingest", dlt_dags), ("transform", dbt_dags)):
+        subdir = os.path.join(config_dir, kind)
+        os.makedirs(subdir, exist_ok=True)
+        for index in range(count):
+            if kind == "ingest":
+                config = dlt_config(index, **dlt_options)
+            else:
+                config = dbt_config(index, groups)
+            # Both extensions are accepted by the factory
+            extension = '.yaml' if index % 5 else '.yml'
+            with open(os.path.join(subdir, f"synthetic_{index}{extension}"), 'w', encoding='utf-8') as f:
+                yaml.safe_dump(config, f, sort_keys=False)
+
+
+def generate_dbt_project(project_path: str, groups: int = 10, models_per_group: int = 10):
+    """
+    Write a dbt project with a compiled manifest of chained models, tagged by group.
+
+    The manifest is written directly instead of running `dbt parse`; stamp it with
+    `dbt_manifest.stamp_manifest` so that the factory renders from it.
+    """
+    nodes = {}
+    for group in range(groups):
+        previous = None
+        for model in range(models_per_group):
+            name = f"model_{group}_{model}"
+            path = f"models/group_{group}/{name}.sql"
+            os.makedirs(os.path.join(project_path, os.path.dirname(path)), exist_ok=True)
+            with open(os.path.join(project_path, path), 'w', encoding='utf-8') as f:
+                f.write(f"select * from {{{{ ref('{previous}') }}}}\n" if previous else "select 1 as id\n")
+            tags = ["transform", "dbt", f"group_{group}"]
+            unique_id = f"model.synthetic.{name}"
+            nodes[unique_id] = {
+                "unique_id": unique_id,
+                "name": name,
+                "resource_type": "model",
+                "package_name": "synthetic",
+                "original_file_path": path,
+                "depends_on": {"nodes": [f"model.synthetic.{previous}"] if previous else []},
+                "tags": tags,
+                "config": {"materialized": "table", "tags": tags},
+            }
+            previous = name
+
+    with open(os.path.join(project_path, 'dbt_project.yml'), 'w', encoding='utf-8') as f:
+        yaml.safe_dump({"name": "synthetic", "version": "1.0.0", "profile": "bigquery"}, f)
+    with open(os.path.join(project_path, 'profiles.yml'), 'w', encoding='utf-8') as f:
+        yaml.safe_dump({"bigquery": {"target": "prod", "outputs": {"prod": {
+            "type": "bigquery", "method": "oauth", "project": "synthetic", "dataset": "synthetic", "threads": 1,
+        }}}}, f)
+    os.makedirs(os.path.join(project_path, 'target'), exist_ok=True)
+    with open(os.path.join(project_path, 'target', 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump({"metadata": {"project_name": "synthetic"}, "nodes": nodes, "sources": {}, "exposures": {}}, f)
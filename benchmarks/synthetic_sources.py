@@ -0,0 +1,33 @@
+"""
+dlt sources referenced by the synthetic dlt configs of the benchmarks.
+
+They only declare resources, nothing is extracted while DAGs are built.
+"""
+from typing import List, Optional
+
+import dlt
+
+from synthetic import SYNTHETIC_SOURCES
+
+
+def _resources(name: str, resources: int, stream_name: Optional[str], columns: Optional[List[str]]):
+    prefix = stream_name or name
+
+    def rows(resource: int):
+        yield [{column: resource for column in columns or ["id"]}]
+
+    return [
+        dlt.resource(rows(resource), name=f"{prefix}_{resource}".replace('-', '_'))
+        for resource in range(resources)
+    ]
+
+
+def _make_source(name: str):
+    def source(resources: int = 1, stream_name: Optional[str] = None, columns: Optional[List[str]] = None):
+        return _resources(name, resources, stream_name, columns)
+
+    source.__name__ = name
+    return dlt.source(name=name)(source)
+
+
+synthetic_source_a, synthetic_source_b, synthetic_source_c = (_make_source(name) for name in SYNTHETIC_SOURCES)
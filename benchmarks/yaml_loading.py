@@ -0,0 +1,90 @@
+"""
+Benchmark of the YAML config loading paths of the DAG factory.
+
+Generates a synthetic config tree (see `synthetic.py`) and compares the pure-Python
+`SafeLoader`, the libyaml-backed loader and the parsed-config sidecars, after checking that every
+path returns exactly what the pure-Python loader returns:
+
+    python benchmarks/yaml_loading.py --files 1000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import yaml
+
+REPO_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_PATH, 'dags', 'dag_factory', 'common'))
+
+import yaml_loader  # noqa: E402  pylint: disable=C0413
+from synthetic import generate_config_tree  # noqa: E402  pylint: disable=C0413
+
+
+def config_files(config_dir: str):
+    """Return the config files of a tree, in the order the DAG factory reads them."""
+    return sorted(
+        os.path.join(root, file)
+        for root, _, files in os.walk(config_dir)
+        for file in files
+        if file.endswith(('.yaml', '.yml'))
+    )
+
+
+def pure_python_load(path: str):
+    """Reference loader: PyYAML's pure-Python safe loader."""
+    with open(path, 'rb') as f:
+        return yaml.load(f, Loader=yaml.SafeLoader)
+
+
+def check_parity(paths, sidecar_dir: str):
+    """Fail if any loading path differs from the pure-Python loader."""
+    for path in paths:
+        expected = pure_python_load(path)
+        for loaded in (yaml_loader.load_config_file(path), yaml_loader.load_config_file(path, sidecar_dir)):
+            if loaded != expected or type(loaded) is not type(expected):
+                raise AssertionError(f"Loaded config differs from yaml.safe_load for {path}")
+
+
+def timed(fn, paths, repeat: int) -> float:
+    """Return the best time of `repeat` loads of every path."""
+    best = float('inf')
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        for path in paths:
+            fn(path)
+        best = min(best, time.perf_counter() - started_at)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--files', type=int, default=1000, help='Number of synthetic config files.')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per loading path, the best one is kept.')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        config_dir = os.path.join(workdir, 'pipeline_configs')
+        sidecar_dir = os.path.join(workdir, 'sidecars')
+        generate_config_tree(config_dir, dlt_dags=args.files)
+        paths = config_files(config_dir)
+
+        check_parity(paths + config_files(os.path.join(REPO_PATH, 'dags', 'pipeline_configs')), sidecar_dir)
+
+        results = {
+            'yaml.SafeLoader': timed(pure_python_load, paths, args.repeat),
+            f'yaml_loader ({yaml_loader.SafeLoader.__name__})': timed(yaml_loader.load_config_file, paths, args.repeat),
+            f'yaml_loader + {yaml_loader.SIDECAR_EXTENSION} sidecar': timed(
+                lambda path: yaml_loader.load_config_file(path, sidecar_dir), paths, args.repeat
+            ),
+        }
+
+    baseline = results['yaml.SafeLoader']
+    print(f"{len(paths)} files, best of {args.repeat}")
+    for label, seconds in results.items():
+        print(f"{label:<40} {seconds * 1000:>9.1f} ms  {baseline / seconds:>5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+"""
+This module provides a bounded, multi-process-safe cache for results needed at DAG-parse time.
+
+Values are pickled to one file per key in a configurable directory and fronted by an
+in-process LRU. Files are written atomically (write then rename), and expired keys are
+refreshed by a single process holding the key lock: concurrent parsers keep serving the stale
+value, or wait for the refresh when there is none, instead of all calling the source at once.
+Both layers are bounded: the oldest files are evicted when the directory exceeds its size or
+entry count limits.
+"""
+import logging
+import os
+import pickle
+import re
+import tempfile
+from collections import Counter, OrderedDict
+from time import time
+from typing import Any, Callable, Dict, Tuple
+
+from filelock import FileLock, Timeout
+
+logger = logging.getLogger('airflow')
+
+
+class DiskCache:
+    """
+    Disk-backed cache with an in-process LRU in front of it.
+
+    The age of an entry is the modification time of its file, so entries written by other
+    processes expire consistently. After every write, the `.cache` files of the directory are
+    evicted oldest first until they fit in `max_bytes` and `max_entries`.
+
+    Attributes:
+        cache_dir (str): Directory where cached values are stored.
+        lru_size (int): Maximum number of values kept in memory (0 disables the in-process layer).
+        lock_timeout (float): Seconds to wait for another process refreshing a key without a stale value.
+        max_bytes (int): Maximum total size of the `.cache` files of the directory.
+        max_entries (int): Maximum number of `.cache` files in the directory.
+        exact_names (bool): Whether keys are file names used as is, the mapping of `get_with_cache`,
+            instead of being sanitized and suffixed with `.cache`.
+        metrics (Counter): Counters of `memory_hits`, `hits`, `misses`, `refreshes`, `stale_hits` and
+            `evictions`.
+    """
+
+    def __init__(self, cache_dir: str, lru_size: int = 128, lock_timeout: float = 60,
+                 max_bytes: int = 256 * 2 ** 20, max_entries: int = 10000, exact_names: bool = False):
+        self.cache_dir = cache_dir
+        self.lru_size = lru_size
+        self.lock_timeout = lock_timeout
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.exact_names = exact_names
+        self.metrics = Counter()
+        self._lru: OrderedDict = OrderedDict()
+
+    def path(self, key: str) -> str:
+        """Return the file storing a key."""
+        if self.exact_names:
+            return os.path.join(self.cache_dir, key)
+        return os.path.join(self.cache_dir, f"{re.sub(r'[^A-Za-z0-9_.-]', '_', key)}.cache")
+
+    def get(self, cache_key: str, fn: Callable, expire_at_sec: int = 86400, *args, **kwargs) -> Any:  # pylint: disable=W1113
+        """
+        Return the cached value of a key, calling `fn(*args, **kwargs)` to refresh it when expired.
+
+        Args:
+            cache_key (str): Cache key.
+            fn (Callable): Function producing the value.
+            expire_at_sec (int): Age in seconds after which the value is refreshed. Negative values
+                never expire, 0 always refreshes (default: 1 day).
+
+        Returns:
+            Any: The cached or refreshed value.
+        """
+        if cache_key in self._lru:
+            value, stored_at = self._lru[cache_key]
+            if self._is_fresh(stored_at, expire_at_sec):
+                self._lru.move_to_end(cache_key)
+                self.metrics["memory_hits"] += 1
+                return value
+
+        path = self.path(cache_key)
+        stored = self._read(path)
+        if stored is not None and self._is_fresh(stored[1], expire_at_sec):
+            self.metrics["hits"] += 1
+            return self._remember(cache_key, stored)
+
+        self.metrics["misses"] += 1
+        os.makedirs(self.cache_dir, exist_ok=True)
+        lock = FileLock(f"{path}.lock")
+        try:
+            lock.acquire(timeout=0 if stored is not None else self.lock_timeout)
+        except Timeout:
+            if stored is None:
+                raise
+            # Another process is refreshing the key
+            self.metrics["stale_hits"] += 1
+            return stored[0]
+
+        try:
+            # The key may have been refreshed while waiting for the lock
+            refreshed = self._read(path)
+            if refreshed is not None and self._is_fresh(refreshed[1], expire_at_sec):
+                self.metrics["hits"] += 1
+                return self._remember(cache_key, refreshed)
+
+            value = fn(*args, **kwargs)
+            self.metrics["refreshes"] += 1
+            self._write(path, value)
+            self._evict(keep=path)
+            return self._remember(cache_key, (value, time()))
+        finally:
+            lock.release()
+
+    def invalidate(self, key: str):
+        """Drop a key from both the in-process and the disk layers."""
+        self._lru.pop(key, None)
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _is_fresh(stored_at: float, expire_at_sec: int) -> bool:
+        if expire_at_sec < 0:
+            return True
+        return expire_at_sec > 0 and time() - stored_at < expire_at_sec
+
+    @staticmethod
+    def _read(path: str):
+        """Return the value stored in a file with its modification time, or None if unavailable."""
+        try:
+            with open(path, 'rb') as f:
+                stored_at = os.fstat(f.fileno()).st_mtime
+                return pickle.load(f), stored_at
+        except FileNotFoundError:
+            return None
+        except Exception as e:  # pylint: disable=W0718
+            logger.warning('Ignoring unreadable cache file %s: %s', path, e)
+            return None
+
+    def _write(self, path: str, value: Any):
+        """Store a value, replacing the existing file atomically."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix='.cache-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(value, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def _evict(self, keep: str):
+        """Remove the oldest `.cache` files, but `keep`, until the directory fits in its limits."""
+        entries = []
+        with os.scandir(self.cache_dir) as scan:
+            for entry in scan:
+                if entry.name.endswith('.cache') and entry.path != keep and entry.is_file():
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        count = len(entries) + 1
+        total = sum(size for _, size, _ in entries) + os.path.getsize(keep)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes and count <= self.max_entries:
+                break
+            for evicted in (path, f"{path}.lock"):
+                try:
+                    os.remove(evicted)
+                except FileNotFoundError:
+                    pass
+            total -= size
+            count -= 1
+            self.metrics["evictions"] += 1
+
+    def _remember(self, key: str, stored: tuple) -> Any:
+        """Keep a value in the in-process LRU and return it."""
+        if self.lru_size > 0:
+            self._lru[key] = stored
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.lru_size:
+                self._lru.popitem(last=False)
+        return stored[0]
+
+
+_caches: Dict[Tuple[str, bool], DiskCache] = {}
+
+
+def get_cache(cache_dir: str, exact_names: bool = False) -> DiskCache:
+    """
+    Return the process-wide cache of a directory.
+
+    Args:
+        cache_dir (str): Directory where cached values are stored.
+        exact_names (bool): Whether keys are file names used as is (default: False).
+
+    Returns:
+        DiskCache: The cache shared by all callers using the same directory and key mapping.
+    """
+    if (cache_dir, exact_names) not in _caches:
+        _caches[(cache_dir, exact_names)] = DiskCache(cache_dir, exact_names=exact_names)
+    return _caches[(cache_dir, exact_names)]
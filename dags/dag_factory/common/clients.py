@@ -0,0 +1,75 @@
+"""
+This module provides a per-process pool of the API clients used by dlt sources.
+
+dlt sources are called while DAGs are built, to resolve their resources, so they must not create
+clients in their body: credential discovery and client setup would run on every parse loop.
+Sources get their clients from `get_client` when their resources are extracted, inside the task.
+A client is created once per process and arguments and shared by later calls, including the
+threads of the process. The pool is emptied in forked children, which must not reuse the
+connections of their parent. While DAGs are built the pool refuses to create clients in the whole
+process, including the threads started by the builders, so that a source creating one at parse
+time fails loudly instead of slowing down every parse loop.
+"""
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable
+
+_clients: Dict[Hashable, Any] = {}
+_lock = threading.Lock()
+# Number of `building_dags` contexts open in the process, a counter since builds may overlap in threads
+_building_dags = 0
+
+
+class ClientAtParseTimeError(RuntimeError):
+    """Raised when a client is requested while DAGs are built."""
+
+
+def get_client(factory: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Return the pooled client built by `factory(*args, **kwargs)`, creating it on first use.
+
+    Args:
+        factory (Callable[..., Any]): Client class or function, e.g. `bigquery.Client`.
+        args, kwargs: Hashable arguments of the factory, part of the pool key.
+
+    Returns:
+        Any: The client shared by the current process.
+    """
+    key = (factory, args, tuple(sorted(kwargs.items())))
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    if _building_dags:
+        raise ClientAtParseTimeError(
+            f"{getattr(factory, '__qualname__', factory)} client requested while building DAGs, "
+            "create it when resources are extracted instead of in the source body"
+        )
+    with _lock:
+        if key not in _clients:
+            _clients[key] = factory(*args, **kwargs)
+        return _clients[key]
+
+
+@contextmanager
+def building_dags():
+    """Refuse to create pooled clients in the process for the duration of the context, used around DAG building."""
+    global _building_dags  # pylint: disable=W0603
+    with _lock:
+        _building_dags += 1
+    try:
+        yield
+    finally:
+        with _lock:
+            _building_dags -= 1
+
+
+def _reset_after_fork():
+    """Drop the clients and the lock inherited from the parent, whose connections must not be shared."""
+    global _lock, _building_dags  # pylint: disable=W0603
+    _lock = threading.Lock()
+    _building_dags = 0
+    _clients.clear()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
@@ -1,10 +1,52 @@
 """
 This module provides functionality to render SQL templates using the Jinja2
-templating engine. It includes a single function, render_sql_template, which
-takes a file path to a SQL template and a dictionary of variables, and returns
-the rendered SQL query as a string.
+templating engine. Templates are loaded through a shared environment per root folder
+(the ingest queries and transform folders), so that a template name never resolves to
+a file of another root. Each environment keeps compiled templates in memory,
+recompiles them when their file changes and stores their bytecode on disk, so that
+DAG parsing does not parse and compile every template again.
 """
-from jinja2 import Template
+import os
+from functools import lru_cache
+from typing import Dict, Iterable, Tuple
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+from dag_factory.common.constants import INGEST_QUERY_FILE_PATH, TEMPLATE_CACHE_PATH, TRANSFORM_PATH
+
+TEMPLATE_ROOTS = (INGEST_QUERY_FILE_PATH, TRANSFORM_PATH)
+
+
+@lru_cache(maxsize=None)
+def get_environment(root: str) -> Environment:
+    """
+    Return the shared Jinja environment of a template folder.
+
+    Args:
+        root (str): Folder the templates are loaded from.
+
+    Returns:
+        Environment: Environment reloading templates whose file changed, with an on-disk bytecode cache.
+    """
+    os.makedirs(TEMPLATE_CACHE_PATH, exist_ok=True)
+    return Environment(
+        loader=FileSystemLoader(root),
+        auto_reload=True,
+        cache_size=-1,
+        bytecode_cache=FileSystemBytecodeCache(TEMPLATE_CACHE_PATH),
+    )
+
+
+def _resolve(template_path: str) -> Tuple[Environment, str]:
+    """Return the environment of the root containing a template file and the template name within it."""
+    path = os.path.abspath(template_path)
+    roots = [root for root in TEMPLATE_ROOTS if path.startswith(os.path.join(os.path.abspath(root), ''))]
+    if roots:
+        # The innermost root, should the roots be nested
+        root = os.path.abspath(max(roots, key=len))
+        return get_environment(root), os.path.relpath(path, root).replace(os.sep, '/')
+    # Templates outside of the roots are loaded from their own folder
+    return get_environment(os.path.dirname(path)), os.path.basename(path)
 
 
 def render_sql_template(template_path, variables):
@@ -18,7 +60,19 @@ def render_sql_template(template_path, variables):
         Returns:
             str: The rendered SQL query as a string.
     """
-    with open(template_path, 'r', encoding='utf-8') as file:
-        template_content = file.read()
-    template = Template(template_content)
-    return str(template.render(variables))
+    environment, name = _resolve(template_path)
+    return str(environment.get_template(name).render(variables))
+
+
+def render_many(templates: Iterable[str], variables: dict) -> Dict[str, str]:
+    """
+        Render several SQL template files with the same variables.
+
+        Args:
+            templates (Iterable[str]): The file paths to the SQL template files.
+            variables (dict): A dictionary containing the variables to be rendered into the templates.
+
+        Returns:
+            Dict[str, str]: The rendered SQL queries keyed by template file path.
+    """
+    return {template_path: render_sql_template(template_path, variables) for template_path in templates}
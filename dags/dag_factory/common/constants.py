@@ -18,7 +18,30 @@ DBT_PROFILES_PATH = f"{DAGS_PATH}/transform/dbt/profiles.yml"
 INGEST_CONFIG_PATH = f"{DAGS_PATH}/pipeline_configs/ingest"
 INGEST_QUERY_FILE_PATH = f'{DAGS_PATH}/ingest/push/extract_queries'
 
-VICTORIA_URL = ""
+VICTORIA_URL = os.getenv("DAG_FACTORY_VICTORIA_URL", "")
+
+# Private to the user running Airflow: the DAG snapshot and the disk cache are pickled
+CACHE_PATH = os.getenv(
+    "DAG_FACTORY_CACHE_PATH",
+    os.path.join(os.getenv("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "dag_factory"),
+)
+DAG_SNAPSHOT_PATH = f"{CACHE_PATH}/dag_snapshot.pickle"
+DBT_DEPS_CACHE_PATH = f"{CACHE_PATH}/dbt_packages"
+VARIABLE_CACHE_PATH = f"{CACHE_PATH}/variables"
+TEMPLATE_CACHE_PATH = f"{CACHE_PATH}/jinja"
+# Parsed YAML configs sidecars, regenerated when a config changes (disabled unless set to 1)
+CONFIG_SIDECAR_PATH = f"{CACHE_PATH}/configs" if os.getenv("DAG_FACTORY_CONFIG_SIDECAR", "0") == "1" else None
+VARIABLE_CACHE_EXPIRE_SEC = int(os.getenv("DAG_FACTORY_VARIABLE_CACHE_EXPIRE_SEC", "86400"))
+
+# Workers parsing and validating changed configs concurrently (disabled below 2)
+DAG_FACTORY_PARALLELISM = int(os.getenv("DAG_FACTORY_PARALLELISM", "0"))
+DAG_FACTORY_EXECUTOR = os.getenv("DAG_FACTORY_EXECUTOR", "process")
+
+# Parse-time metrics exporter: "file", "statsd", "victoria" (pushes to VICTORIA_URL) or empty to disable
+METRICS_EXPORTER = os.getenv("DAG_FACTORY_METRICS_EXPORTER", "")
+METRICS_FILE_PATH = os.getenv("DAG_FACTORY_METRICS_FILE", f"{CACHE_PATH}/metrics.statsd")
+STATSD_HOST = os.getenv("DAG_FACTORY_STATSD_HOST", "localhost")
+STATSD_PORT = int(os.getenv("DAG_FACTORY_STATSD_PORT", "8125"))
 
 DAG_OWNERS = {
     "all": ["dlt", "ingest", "dbt", "transform"],
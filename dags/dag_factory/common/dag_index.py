@@ -0,0 +1,164 @@
+"""
+This module provides a persisted index of DAG ids to the configuration files defining them.
+
+The index is built at sync time and lets a task process read exactly one configuration file
+instead of scanning the whole config directory. It only depends on PyYAML so that it can be
+built outside of an Airflow environment:
+
+    python dags/dag_factory/common/dag_index.py dags/pipeline_configs
+"""
+import hashlib
+import json
+import logging
+import os
+import sys
+import tempfile
+from typing import Optional, Tuple
+
+try:
+    from dag_factory.common.yaml_loader import load_yaml
+except ImportError:
+    # Run as a standalone script, outside of an Airflow environment
+    from yaml_loader import load_yaml
+
+logger = logging.getLogger('airflow')
+
+DAG_INDEX_FILENAME = 'dag_index.json'
+DAG_INDEX_VERSION = 1
+
+
+def _file_entry(file_path: str, content: bytes, config_dir: str) -> dict:
+    """Describe a config file by its path relative to the config directory, mtime and content hash."""
+    return {
+        "path": os.path.relpath(file_path, config_dir),
+        "mtime_ns": os.stat(file_path).st_mtime_ns,
+        "sha256": hashlib.sha256(content).hexdigest(),
+    }
+
+
+def build_index(config_dir: str) -> dict:
+    """
+    Build the DAG id index of a configuration directory.
+
+    The directory layout is the one expected by `DagGenerator.create_dags`: one level of
+    subdirectories containing `.yaml`/`.yml` files with a top-level `dags` mapping.
+
+    Args:
+        config_dir (str): Path to the configuration directory.
+
+    Returns:
+        dict: The index content, mapping DAG ids to their file entries.
+    """
+    dags = {}
+    for subdir in sorted(os.listdir(config_dir)):
+        subdir_path = os.path.join(config_dir, subdir)
+        if not os.path.isdir(subdir_path):
+            continue
+        for filename in sorted(os.listdir(subdir_path)):
+            if not (filename.endswith('.yaml') or filename.endswith('.yml')):
+                continue
+            file_path = os.path.join(subdir_path, filename)
+            with open(file_path, 'rb') as f:
+                content = f.read()
+            entry = _file_entry(file_path, content, config_dir)
+            for item in (load_yaml(content) or {}).get("dags") or {}:
+                if item in dags:
+                    raise ValueError(f"DAG '{item}' is defined in both {dags[item]['path']} and {entry['path']}")
+                dags[item] = entry
+    return {"version": DAG_INDEX_VERSION, "dags": dags}
+
+
+def write_index(index: dict, index_path: str):
+    """
+    Store the index, replacing any existing file atomically.
+
+    Args:
+        index (dict): Index content returned by `build_index`.
+        index_path (str): Destination path of the index.
+    """
+    directory = os.path.dirname(index_path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.dag_index-')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, index_path)
+
+
+class DagIndex:
+    """
+    Read side of the persisted DAG id index.
+
+    Attributes:
+        config_dir (str): Configuration directory the index paths are relative to.
+        index_path (str): Path to the index file inside the configuration directory.
+    """
+
+    def __init__(self, config_dir: str):
+        self.config_dir = config_dir
+        self.index_path = os.path.join(config_dir, DAG_INDEX_FILENAME)
+        self._dags = None
+
+    def _entries(self) -> dict:
+        """Load the index on first use. A missing or unreadable index behaves as an empty one."""
+        if self._dags is None:
+            try:
+                with open(self.index_path, encoding='utf-8') as f:
+                    index = json.load(f)
+                self._dags = index["dags"] if index.get("version") == DAG_INDEX_VERSION else {}
+            except FileNotFoundError:
+                self._dags = {}
+            except (ValueError, KeyError) as e:
+                logger.warning('Ignoring unreadable DAG index %s: %s', self.index_path, e)
+                self._dags = {}
+        return self._dags
+
+    def lookup(self, dag_id: str) -> Optional[str]:
+        """
+        Return the path of the configuration file defining a DAG if the index entry is fresh.
+
+        Args:
+            dag_id (str): Id of the DAG to look up.
+
+        Returns:
+            Optional[str]: Absolute path to the configuration file, or None if the DAG is unknown
+                or its entry is stale.
+        """
+        resolved = self.resolve(dag_id)
+        return resolved[0] if resolved is not None else None
+
+    def resolve(self, dag_id: str) -> Optional[Tuple[str, Optional[bytes]]]:
+        """
+        Return the configuration file defining a DAG if the index entry is fresh, with its content
+        when it had to be read.
+
+        An entry is fresh when the file has the indexed mtime, or when its content still has the
+        indexed hash (mtimes are not preserved when configs are synced to the bucket). In the
+        latter case the content read to hash the file is returned, so that it is not read again.
+
+        Args:
+            dag_id (str): Id of the DAG to look up.
+
+        Returns:
+            Optional[Tuple[str, Optional[bytes]]]: Absolute path to the configuration file and its
+                content if it was read, or None if the DAG is unknown or its entry is stale.
+        """
+        entry = self._entries().get(dag_id)
+        if entry is None:
+            return None
+
+        file_path = os.path.abspath(os.path.join(self.config_dir, entry["path"]))
+        try:
+            if os.stat(file_path).st_mtime_ns == entry["mtime_ns"]:
+                return file_path, None
+            with open(file_path, 'rb') as f:
+                content = f.read()
+        except FileNotFoundError:
+            return None
+
+        if hashlib.sha256(content).hexdigest() == entry["sha256"]:
+            return file_path, content
+        return None
+
+
+if __name__ == '__main__':
+    target_dir = sys.argv[1]
+    write_index(build_index(target_dir), os.path.join(target_dir, DAG_INDEX_FILENAME))
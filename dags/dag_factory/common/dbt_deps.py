@@ -0,0 +1,118 @@
+"""
+This module manages a cache of installed dbt packages shared by all dbt tasks of a worker.
+
+Packages are installed once per hash of the project package files into a read-only directory
+which dbt tasks use through `DBT_PACKAGES_INSTALL_PATH`, instead of running `dbt deps` before
+every model and test node. The cache can be warmed at deploy time:
+
+    python dags/dag_factory/common/dbt_deps.py <dbt project path> <cache path>
+"""
+import hashlib
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from typing import Optional
+
+from filelock import FileLock
+
+logger = logging.getLogger('airflow')
+
+PACKAGE_FILES = ['packages.yml', 'dependencies.yml', 'package-lock.yml']
+PACKAGES_INSTALL_PATH_VAR = 'DBT_PACKAGES_INSTALL_PATH'
+
+
+def packages_hash(project_path: str) -> Optional[str]:
+    """
+    Hash the package files of a dbt project.
+
+    Args:
+        project_path (str): Path to the dbt project.
+
+    Returns:
+        Optional[str]: The sha256 of the package files, or None if the project has no packages.
+    """
+    digest = hashlib.sha256()
+    found = False
+    for name in PACKAGE_FILES:
+        path = os.path.join(project_path, name)
+        if os.path.isfile(path):
+            found = True
+            with open(path, 'rb') as f:
+                digest.update(name.encode('utf-8') + b'\0' + f.read())
+    return digest.hexdigest() if found else None
+
+
+def packages_path(project_path: str, cache_path: str) -> Optional[str]:
+    """
+    Return the cache directory holding the packages of a dbt project, installed or not.
+
+    Args:
+        project_path (str): Path to the dbt project.
+        cache_path (str): Root directory of the packages cache.
+
+    Returns:
+        Optional[str]: The packages directory, or None if the project has no packages.
+    """
+    digest = packages_hash(project_path)
+    return os.path.join(cache_path, digest) if digest else None
+
+
+def ensure_packages(project_path: str, cache_path: str) -> Optional[str]:
+    """
+    Install the packages of a dbt project into the cache unless they are already there.
+
+    Only one process installs a given packages hash; concurrent callers wait for it and then
+    reuse the result. The installation is moved into place atomically.
+
+    Args:
+        project_path (str): Path to the dbt project.
+        cache_path (str): Root directory of the packages cache.
+
+    Returns:
+        Optional[str]: The installed packages directory, or None if the project has no packages.
+    """
+    target = packages_path(project_path, cache_path)
+    if target is None or os.path.isdir(target):
+        return target
+
+    os.makedirs(cache_path, exist_ok=True)
+    with FileLock(f"{target}.lock"):
+        if os.path.isdir(target):
+            return target
+
+        # dbt deps writes the lock file into the project, which is read-only on workers
+        workdir = tempfile.mkdtemp(dir=cache_path, prefix='.deps-')
+        try:
+            for name in ['dbt_project.yml'] + PACKAGE_FILES:
+                if os.path.isfile(os.path.join(project_path, name)):
+                    shutil.copy(os.path.join(project_path, name), workdir)
+            install_path = os.path.join(workdir, 'dbt_packages')
+            logger.info('Installing dbt packages of %s into %s', project_path, target)
+            subprocess.run(
+                ["dbt", "deps", "--project-dir", workdir],
+                env={**os.environ, PACKAGES_INSTALL_PATH_VAR: install_path},
+                check=True,
+            )
+            os.replace(install_path, target)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return target
+
+
+def prepare_packages(context, project_path: str, cache_path: str):  # pylint: disable=W0613
+    """
+    Operator `pre_execute` hook installing the dbt packages on the worker if needed.
+
+    Args:
+        context (dict): Airflow task context.
+        project_path (str): Path to the dbt project.
+        cache_path (str): Root directory of the packages cache.
+    """
+    ensure_packages(project_path, cache_path)
+
+
+if __name__ == '__main__':
+    ensure_packages(sys.argv[1], sys.argv[2])
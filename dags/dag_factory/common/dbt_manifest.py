@@ -0,0 +1,100 @@
+"""
+This module resolves the pre-compiled dbt manifest used to render dbt DAGs.
+
+The manifest is compiled once at deploy time (`dbt parse`) and stamped with a fingerprint of
+the dbt project sources. At DAG-parse time the manifest is only used if the fingerprint of the
+deployed sources still matches, otherwise rendering falls back to automatic loading. Stamping
+only depends on the standard library, so it can run right after `dbt parse` in CI:
+
+    python dags/dag_factory/common/dbt_manifest.py dags/transform/dbt
+"""
+import hashlib
+import logging
+import os
+import sys
+from functools import lru_cache
+from typing import Optional
+
+logger = logging.getLogger('airflow')
+
+MANIFEST_PATH = 'target/manifest.json'
+FINGERPRINT_PATH = 'target/manifest.fingerprint'
+
+PROJECT_FILES = ['dbt_project.yml', 'packages.yml', 'dependencies.yml', 'package-lock.yml']
+PROJECT_DIRS = ['models', 'macros', 'seeds', 'snapshots', 'tests', 'analyses']
+
+
+def project_fingerprint(project_path: str) -> str:
+    """
+    Compute a fingerprint of all dbt project sources that affect the manifest.
+
+    Args:
+        project_path (str): Path to the dbt project.
+
+    Returns:
+        str: The sha256 of the relative paths and contents of the project sources.
+    """
+    paths = [name for name in PROJECT_FILES if os.path.isfile(os.path.join(project_path, name))]
+    for directory in PROJECT_DIRS:
+        for root, _, files in os.walk(os.path.join(project_path, directory)):
+            paths.extend(os.path.relpath(os.path.join(root, file), project_path) for file in files)
+
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        digest.update(path.encode('utf-8') + b'\0')
+        with open(os.path.join(project_path, path), 'rb') as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+def stamp_manifest(project_path: str):
+    """
+    Store the fingerprint of the project sources next to a freshly compiled manifest.
+
+    Args:
+        project_path (str): Path to the dbt project.
+    """
+    if not os.path.isfile(os.path.join(project_path, MANIFEST_PATH)):
+        raise FileNotFoundError(f"No compiled manifest in {project_path}, run `dbt parse` first")
+    with open(os.path.join(project_path, FINGERPRINT_PATH), 'w', encoding='utf-8') as f:
+        f.write(project_fingerprint(project_path))
+
+
+@lru_cache(maxsize=None)
+def _fresh_manifest_path(project_path: str, manifest_mtime_ns: int) -> Optional[str]:  # pylint: disable=W0613
+    """Check a manifest once per process and manifest version."""
+    try:
+        with open(os.path.join(project_path, FINGERPRINT_PATH), encoding='utf-8') as f:
+            fingerprint = f.read().strip()
+    except FileNotFoundError:
+        logger.info('dbt manifest in %s is not stamped, rendering with automatic load', project_path)
+        return None
+
+    if fingerprint != project_fingerprint(project_path):
+        logger.warning('dbt manifest in %s is stale, rendering with automatic load', project_path)
+        return None
+    return os.path.join(project_path, MANIFEST_PATH)
+
+
+def fresh_manifest_path(project_path: str) -> Optional[str]:
+    """
+    Return the compiled manifest of a dbt project if it matches the deployed sources.
+
+    The check is memoized per process and manifest version, so all dbt DAGs parsed together
+    share a single verification of the manifest.
+
+    Args:
+        project_path (str): Path to the dbt project.
+
+    Returns:
+        Optional[str]: Path to the manifest, or None if it is missing or stale.
+    """
+    try:
+        manifest_mtime_ns = os.stat(os.path.join(project_path, MANIFEST_PATH)).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    return _fresh_manifest_path(project_path, manifest_mtime_ns)
+
+
+if __name__ == '__main__':
+    stamp_manifest(sys.argv[1])
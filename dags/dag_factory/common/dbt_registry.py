@@ -0,0 +1,99 @@
+"""
+This module provides a per-process registry of Cosmos configurations shared by all dbt DAGs.
+
+The project, profile and render inputs are identical for every dbt DAG of a project, so they
+are built once per (project path, profiles path, target) and reused by every `DbtTaskGroup`
+instead of being rebuilt for each DAG.
+"""
+import copy
+from functools import lru_cache, partial
+from typing import Any, Dict, NamedTuple, Optional
+
+from cosmos import LoadMode, ProfileConfig, ProjectConfig
+
+from dag_factory.common.dbt_deps import PACKAGES_INSTALL_PATH_VAR, packages_path, prepare_packages
+from dag_factory.common.dbt_manifest import fresh_manifest_path
+
+
+class DbtProject(NamedTuple):
+    """
+    Cosmos configuration shared by all dbt DAGs of a project.
+
+    Attributes:
+        project_config (ProjectConfig): Cosmos project configuration.
+        profile_config (ProfileConfig): Cosmos profile configuration.
+        load_method (LoadMode): Method used to load the project graph.
+        operator_args (Dict[str, Any]): Operator arguments common to all dbt tasks.
+    """
+    project_config: ProjectConfig
+    profile_config: ProfileConfig
+    load_method: LoadMode
+    operator_args: Dict[str, Any]
+
+
+def _operator_args(project_path: str, target: str, deps_cache_path: str) -> Dict[str, Any]:
+    """
+    Build the operator arguments common to all dbt tasks of a project.
+
+    `dbt deps` is never run by the tasks themselves: packages are installed once per worker into
+    the packages cache by a `pre_execute` hook and read from there. The incremental models pick
+    their processed window from the data loaded since their last build (see macros/event_window.sql).
+    """
+    operator_args = {
+        "dbt_cmd_global_flags": ["--debug"],
+        "vars": {
+            "etl_ts": "{{ data_interval_end.strftime('%Y-%m-%d-%H:%M:%S') }}",
+        },
+        "ENV": {"ENV": target},
+        "install_deps": False,
+    }
+
+    installed_packages_path = packages_path(project_path, deps_cache_path)
+    if installed_packages_path:
+        # Added to the task environment, not replacing it
+        operator_args["append_env"] = True
+        operator_args["env"] = {PACKAGES_INSTALL_PATH_VAR: installed_packages_path}
+        operator_args["pre_execute"] = partial(
+            prepare_packages, project_path=project_path, cache_path=deps_cache_path
+        )
+    return operator_args
+
+
+@lru_cache(maxsize=None)
+def _dbt_project(project_path: str, profiles_path: str, target: str, deps_cache_path: str,
+                 manifest_path: Optional[str]) -> DbtProject:
+    """Build the shared configuration of a project once per process and manifest."""
+    return DbtProject(
+        project_config=ProjectConfig(
+            dbt_project_path=project_path,
+            manifest_path=manifest_path,
+        ),
+        profile_config=ProfileConfig(
+            target_name=target,
+            profile_name="bigquery",
+            profiles_yml_filepath=profiles_path,
+        ),
+        load_method=LoadMode.DBT_MANIFEST if manifest_path else LoadMode.AUTOMATIC,
+        operator_args=_operator_args(project_path, target, deps_cache_path),
+    )
+
+
+def get_dbt_project(project_path: str, profiles_path: str, target: str, deps_cache_path: str) -> DbtProject:
+    """
+    Return the shared Cosmos configuration of a dbt project.
+
+    The project graph is loaded from the deploy-time manifest when it is fresh, so every
+    tag-filtered DAG of the project selects from the same compiled graph.
+
+    Args:
+        project_path (str): Path to the dbt project.
+        profiles_path (str): Path to the profiles.yml file.
+        target (str): Name of the dbt target, which is also the Airflow environment.
+        deps_cache_path (str): Root directory of the installed dbt packages cache.
+
+    Returns:
+        DbtProject: The shared configuration. Its `operator_args` are a private copy that may be
+            modified by the caller.
+    """
+    project = _dbt_project(project_path, profiles_path, target, deps_cache_path, fresh_manifest_path(project_path))
+    return project._replace(operator_args=copy.deepcopy(project.operator_args))
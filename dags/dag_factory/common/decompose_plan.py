@@ -0,0 +1,114 @@
+"""
+This module provides the persisted plan of the `decompose: auto` pipeline tasks.
+
+dlt tasks record the statistics of the resources they loaded in Airflow Variables. The plan
+freezes them at sync time, per pipeline, into a file of the config directory, so that the
+scheduler and every worker compute the same task shape from the same statistics until the
+next sync. It only depends on the standard library so that it can be built outside of an
+Airflow environment, from a JSON object of the `dlt_stats` Variables keyed by Variable name
+(see the `Sync dags` workflow):
+
+    python dags/dag_factory/common/decompose_plan.py dlt_stats.json dags/pipeline_configs
+"""
+import json
+import logging
+import os
+import sys
+import tempfile
+from typing import Dict
+
+logger = logging.getLogger('airflow')
+
+DECOMPOSE_PLAN_FILENAME = 'decompose_plan.json'
+DECOMPOSE_PLAN_VERSION = 1
+STATS_VARIABLE_PREFIX = "dlt_stats"
+
+
+def stats_variable(pipeline_name: str, resource: str) -> str:
+    """Return the name of the Variable storing the statistics of a resource."""
+    return f"{STATS_VARIABLE_PREFIX}__{pipeline_name}__{resource}"
+
+
+def build_plan(variables: Dict[str, object]) -> dict:
+    """
+    Build the plan from the exported Variables.
+
+    Args:
+        variables (Dict[str, object]): Variables by key, with their values as JSON strings or
+            deserialized. Other Variables than the statistics are ignored.
+
+    Returns:
+        dict: The plan content, mapping pipeline names to the statistics of their resources.
+    """
+    pipelines: Dict[str, Dict[str, dict]] = {}
+    prefix = f"{STATS_VARIABLE_PREFIX}__"
+    for key, value in variables.items():
+        if not key.startswith(prefix):
+            continue
+        # Resources are root table names, which never contain the separator
+        pipeline_name, _, resource = key[len(prefix):].rpartition("__")
+        stats = json.loads(value) if isinstance(value, str) else value
+        pipelines.setdefault(pipeline_name, {})[resource] = {"rows": stats["rows"], "duration": stats["duration"]}
+    return {"version": DECOMPOSE_PLAN_VERSION, "pipelines": pipelines}
+
+
+def write_plan(plan: dict, plan_path: str):
+    """
+    Store the plan, replacing any existing file atomically.
+
+    Args:
+        plan (dict): Plan content returned by `build_plan`.
+        plan_path (str): Destination path of the plan.
+    """
+    directory = os.path.dirname(plan_path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.decompose_plan-')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(plan, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, plan_path)
+
+
+class DecomposePlan:
+    """
+    Read side of the persisted plan.
+
+    Attributes:
+        config_dir (str): Configuration directory containing the plan.
+        plan_path (str): Path to the plan file inside the configuration directory.
+    """
+
+    def __init__(self, config_dir: str):
+        self.config_dir = config_dir
+        self.plan_path = os.path.join(config_dir, DECOMPOSE_PLAN_FILENAME)
+        self._pipelines = None
+
+    def _entries(self) -> dict:
+        """Load the plan on first use. A missing or unreadable plan behaves as an empty one."""
+        if self._pipelines is None:
+            try:
+                with open(self.plan_path, encoding='utf-8') as f:
+                    plan = json.load(f)
+                self._pipelines = plan["pipelines"] if plan.get("version") == DECOMPOSE_PLAN_VERSION else {}
+            except FileNotFoundError:
+                self._pipelines = {}
+            except (ValueError, KeyError) as e:
+                logger.warning('Ignoring unreadable decompose plan %s: %s', self.plan_path, e)
+                self._pipelines = {}
+        return self._pipelines
+
+    def stats(self, pipeline_name: str) -> Dict[str, dict]:
+        """
+        Return the statistics of the resources of a pipeline frozen in the plan.
+
+        Args:
+            pipeline_name (str): Name of the pipeline.
+
+        Returns:
+            Dict[str, dict]: Statistics keyed by resource, empty if the pipeline never recorded any.
+        """
+        return self._entries().get(pipeline_name, {})
+
+
+if __name__ == '__main__':
+    variables_path, target_dir = sys.argv[1:3]
+    with open(variables_path, encoding='utf-8') as variables_file:
+        write_plan(build_plan(json.load(variables_file)), os.path.join(target_dir, DECOMPOSE_PLAN_FILENAME))
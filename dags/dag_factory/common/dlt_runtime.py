@@ -0,0 +1,294 @@
+"""
+This module runs dlt pipelines inside Airflow tasks with bounded memory and disk usage.
+
+In chunked mode a task runs the pipeline in successive windows instead of once over the whole
+source. Each window re-creates the source, which resumes from the state committed by the
+previous window, and is extracted, normalized and loaded before the next one starts. Writer
+buffers and intermediary files are bounded through the dlt configuration, and completed load
+packages are deleted as soon as they are loaded.
+
+In fan-out mode a source is extracted once into a staging area, and every transformer dataset
+is loaded from the staged files of its stream by its own task, with the hints of the source.
+"""
+import logging
+import os
+import shutil
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+import dlt
+from dlt.common.pipeline import LoadInfo
+from dlt.common.schema.utils import get_root_table, get_write_disposition
+
+logger = logging.getLogger('airflow')
+
+
+def dlt_env(**settings: Optional[Any]) -> Dict[str, str]:
+    """
+    Translate dlt settings into their environment variables, skipping unset ones.
+
+    Args:
+        settings: dlt settings keyed by their dotted config path with `__` separators,
+            e.g. `data_writer__buffer_max_items`.
+
+    Returns:
+        Dict[str, str]: Environment variables understood by the dlt config providers.
+    """
+    return {key.upper(): str(value) for key, value in settings.items() if value is not None}
+
+
+@contextmanager
+def patched_environ(env: Dict[str, str]):
+    """
+    Set environment variables for the duration of the context.
+
+    Args:
+        env (Dict[str, str]): Environment variables to set.
+    """
+    previous = {key: os.environ.get(key) for key in env}
+    os.environ.update(env)
+    try:
+        yield
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def apply_env(context: Dict[str, Any], env: Dict[str, str]):  # pylint: disable=W0613
+    """
+    Operator `pre_execute` hook applying dlt settings to the task process.
+
+    Args:
+        context (Dict[str, Any]): Airflow task context.
+        env (Dict[str, str]): dlt settings as environment variables, see `dlt_env`.
+    """
+    os.environ.update(env)
+
+
+def data_rows(pipeline: dlt.Pipeline) -> int:
+    """
+    Count the data rows normalized by the last run of a pipeline, without the `_dlt_*` tables.
+
+    A run always produces a load package when the source state changed, e.g. a bookmark, so the
+    load ids alone do not tell whether it loaded data.
+
+    Args:
+        pipeline (dlt.Pipeline): The pipeline that ran.
+
+    Returns:
+        int: Number of rows normalized into the tables of the source.
+    """
+    normalize_info = pipeline.last_trace.last_normalize_info if pipeline.last_trace else None
+    if normalize_info is None:
+        return 0
+    return sum(count for table, count in normalize_info.row_counts.items() if not table.startswith("_dlt"))
+
+
+def run_in_windows(
+    pipeline_name: str,
+    dataset_name: str,
+    pipeline_kwargs: Dict[str, Any],
+    source_factory: Callable[[], Any],
+    max_windows: int,
+    env: Dict[str, str],
+    wipe_local_data: bool = True,
+) -> Optional[LoadInfo]:
+    """
+    Run a dlt pipeline window by window until a window loads no data rows.
+
+    Args:
+        pipeline_name (str): Name of the dlt pipeline.
+        dataset_name (str): Name of the destination dataset.
+        pipeline_kwargs (Dict[str, Any]): Other arguments of `dlt.pipeline`.
+        source_factory (Callable[[], Any]): Function building a fresh source for every window.
+        max_windows (int): Maximum number of windows run by the task.
+        env (Dict[str, str]): dlt settings applied to the run, as environment variables.
+        wipe_local_data (bool): Remove the pipeline working folder after the run (default: True).
+
+    Returns:
+        Optional[LoadInfo]: Load info of the last window that loaded data.
+    """
+    pipeline = dlt.pipeline(pipeline_name=pipeline_name, dataset_name=dataset_name, **pipeline_kwargs)
+    last_load_info = None
+    try:
+        with patched_environ({"LOAD__DELETE_COMPLETED_JOBS": "true", **env}):
+            for window in range(max_windows):
+                load_info = pipeline.run(source_factory())
+                if not load_info.loads_ids or not data_rows(pipeline):
+                    logger.info('Pipeline %s has no more data after %s windows', pipeline_name, window)
+                    break
+                logger.info('Window %s of pipeline %s: %s', window, pipeline_name, load_info)
+                last_load_info = load_info
+            else:
+                logger.warning('Pipeline %s stopped after the maximum of %s windows', pipeline_name, max_windows)
+    finally:
+        if wipe_local_data:
+            shutil.rmtree(pipeline.working_dir, ignore_errors=True)
+    return last_load_info
+
+
+def selected_tables(source: Any) -> List[str]:
+    """Return the root tables of the resources selected in a source."""
+    return [
+        source.schema.naming.normalize_table_identifier(
+            resource.table_name if isinstance(resource.table_name, str) else resource.name
+        )
+        for resource in source.selected_resources.values()
+    ]
+
+
+def extract_to_staging(
+    pipeline_name: str,
+    dataset_name: str,
+    pipeline_kwargs: Dict[str, Any],
+    source_factory: Callable[..., Any],
+    bucket_url: str,
+    streams: Optional[List[str]] = None,
+    wipe_local_data: bool = True,
+    env: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    """
+    Run a source once into the staging area shared by the transformers of a fan-out pipeline.
+
+    The staged files are Parquet files laid out by the dlt filesystem destination as
+    `<bucket_url>/<dataset_name>/<table>/<load_id>.<file_id>.parquet`. The root tables selected by
+    every transformer stream are resolved here, from the source built with its `stream_name`, so
+    that the load tasks read them from XCom instead of building the source again.
+
+    Args:
+        pipeline_name (str): Name of the staging dlt pipeline, which also keeps the source state.
+        dataset_name (str): Name of the staging dataset.
+        pipeline_kwargs (Dict[str, Any]): Other arguments of `dlt.pipeline`, the destination and the
+            staging are replaced.
+        source_factory (Callable[..., Any]): Function building the source, with a `stream_name`
+            keyword argument for the transformer streams.
+        bucket_url (str): URL of the staging area.
+        streams (Optional[List[str]]): Names of the transformer streams (default: None).
+        wipe_local_data (bool): Remove the pipeline working folder after the run (default: True).
+        env (Optional[Dict[str, str]]): dlt settings applied to the run, as environment variables.
+
+    Returns:
+        Dict[str, Any]: The staged load ids, the hints of every staged table (columns, write
+            disposition, parent and root tables), the root tables of the staged source and the root
+            tables of every stream, pushed to XCom for the load tasks.
+    """
+    pipeline = dlt.pipeline(
+        pipeline_name=pipeline_name,
+        dataset_name=dataset_name,
+        **{**pipeline_kwargs, "destination": dlt.destinations.filesystem(bucket_url=bucket_url), "staging": None},
+    )
+    try:
+        source = source_factory()
+        with patched_environ(env or {}):
+            load_info = pipeline.run(source, loader_file_format="parquet")
+        logger.info('Staged pipeline %s: %s', pipeline_name, load_info)
+        schema = pipeline.schemas[source.schema.name]
+        return {
+            "load_ids": list(load_info.loads_ids),
+            "tables": {
+                table: {
+                    "columns": schema.get_table_columns(table),
+                    "write_disposition": get_write_disposition(schema.tables, table),
+                    "parent": schema.tables[table].get("parent"),
+                    "root": get_root_table(schema.tables, table)["name"],
+                }
+                for table in schema.data_table_names(seen_data_only=True)
+            },
+            "resources": selected_tables(source),
+            "streams": {stream: selected_tables(source_factory(stream_name=stream)) for stream in streams or []},
+        }
+    finally:
+        if wipe_local_data:
+            shutil.rmtree(pipeline.working_dir, ignore_errors=True)
+
+
+def load_from_staging(
+    pipeline_name: str,
+    dataset_name: str,
+    pipeline_kwargs: Dict[str, Any],
+    bucket_url: str,
+    staging_dataset_name: str,
+    extract_task_id: str,
+    stream_name: Optional[str] = None,
+    wipe_local_data: bool = True,
+    env: Optional[Dict[str, str]] = None,
+    ti=None,
+) -> Optional[LoadInfo]:
+    """
+    Load the files staged by the extract task of the run into a transformer dataset.
+
+    The staged tables of the transformer stream are loaded into the tables of the same name, with
+    the columns, write disposition, keys and parent of the staging schema, so that merge and replace
+    resources keep their semantics. Only the files of the load ids staged by the run are read. A
+    stream table that the staged source does not have fails the task, its data would never be
+    staged; a table without staged data this run is skipped.
+
+    Args:
+        pipeline_name (str): Name of the transformer dlt pipeline.
+        dataset_name (str): Name of the transformer dataset.
+        pipeline_kwargs (Dict[str, Any]): Other arguments of `dlt.pipeline`.
+        bucket_url (str): URL of the staging area.
+        staging_dataset_name (str): Name of the staging dataset.
+        extract_task_id (str): Id of the task that ran `extract_to_staging`.
+        stream_name (Optional[str]): Transformer stream whose root tables, resolved by the extract
+            task, are loaded with their nested tables (default: None, all the staged tables).
+        wipe_local_data (bool): Remove the pipeline working folder after the run (default: True).
+        env (Optional[Dict[str, str]]): dlt settings applied to the run, as environment variables.
+        ti: Airflow task instance, passed by the operator.
+
+    Returns:
+        Optional[LoadInfo]: Load info of the run, None if nothing was staged.
+    """
+    from dlt.sources.filesystem import filesystem, read_parquet  # pylint: disable=C0415
+
+    staged = ti.xcom_pull(task_ids=extract_task_id)
+    tables = None
+    if stream_name is not None:
+        tables = staged["streams"][stream_name]
+        missing = sorted(set(tables) - set(staged["resources"]))
+        if missing:
+            raise ValueError(
+                f"Tables {missing} of stream {stream_name} are not extracted by {extract_task_id}, "
+                f"which stages {sorted(staged['resources'])}"
+            )
+    if not staged["load_ids"] or not staged["tables"]:
+        logger.info('Nothing staged by %s for pipeline %s', extract_task_id, pipeline_name)
+        return None
+
+    prefixes = tuple(f"{load_id}." for load_id in staged["load_ids"])
+    staging_url = f"{bucket_url.rstrip('/')}/{staging_dataset_name}"
+    resources = []
+    for table, hints in staged["tables"].items():
+        if tables is not None and hints["root"] not in tables:
+            continue
+        columns = hints["columns"]
+        files = filesystem(bucket_url=staging_url, file_glob=f"{table}/*.parquet").add_filter(
+            lambda item: os.path.basename(item["relative_path"]).startswith(prefixes)
+        )
+        resource = (files | read_parquet()).with_name(table)
+        resource.apply_hints(
+            table_name=table,
+            parent_table_name=hints["parent"],
+            write_disposition=hints["write_disposition"],
+            columns=columns,
+            primary_key=[column for column, hint in columns.items() if hint.get("primary_key")] or None,
+            merge_key=[column for column, hint in columns.items() if hint.get("merge_key")] or None,
+        )
+        resources.append(resource)
+    if not resources:
+        logger.info('No table of %s staged by %s for pipeline %s', tables, extract_task_id, pipeline_name)
+        return None
+
+    pipeline = dlt.pipeline(pipeline_name=pipeline_name, dataset_name=dataset_name, **pipeline_kwargs)
+    try:
+        with patched_environ(env or {}):
+            load_info = pipeline.run(resources)
+        logger.info('Loaded %s tables staged by %s into %s: %s',
+                    len(resources), extract_task_id, dataset_name, load_info)
+        return load_info
+    finally:
+        if wipe_local_data:
+            shutil.rmtree(pipeline.working_dir, ignore_errors=True)
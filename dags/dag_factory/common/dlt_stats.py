@@ -0,0 +1,90 @@
+"""
+This module records dlt run statistics and uses them to plan the decomposition of pipeline tasks.
+
+Every `decompose: auto` task stores the row count and duration of the resources it loaded in an
+Airflow Variable per resource. The statistics are frozen into the decompose plan at sync time
+(see `decompose_plan`), from which the factory merges tiny resources into a shared task and picks
+the decomposition of the remaining ones, identically on the scheduler and the workers.
+"""
+import json
+import logging
+from typing import Any, Dict, List, Tuple
+
+import pendulum
+
+from dag_factory.common.decompose_plan import stats_variable
+from dag_factory.common.models import AutoDecomposeConfig
+
+logger = logging.getLogger('airflow')
+
+
+def record_stats(context: Dict[str, Any], result: Any, pipeline_name: str):
+    """
+    Operator `post_execute` hook storing the statistics of the resources loaded by a dlt task.
+
+    Row counts of child tables are added to their root table, which is named after the resource.
+
+    Args:
+        context (Dict[str, Any]): Airflow task context.
+        result (Any): Return value of the task, the dlt `LoadInfo` of the run.
+        pipeline_name (str): Name of the pipeline the statistics belong to.
+    """
+    from airflow.models import Variable  # pylint: disable=C0415
+
+    try:
+        row_counts = result.pipeline.last_trace.last_normalize_info.row_counts
+    except AttributeError:
+        logger.info('No dlt statistics to record for %s', pipeline_name)
+        return
+
+    rows: Dict[str, int] = {}
+    for table, count in row_counts.items():
+        if table.startswith("_dlt"):
+            continue
+        resource = table.split("__")[0]
+        rows[resource] = rows.get(resource, 0) + count
+
+    duration = (pendulum.now("UTC") - context["ti"].start_date).total_seconds()
+    for resource, count in rows.items():
+        Variable.set(
+            stats_variable(pipeline_name, resource),
+            json.dumps({"rows": count, "duration": duration, "updated_at": pendulum.now("UTC").isoformat()}),
+        )
+
+
+def plan_runs(resources: List[str], stats: Dict[str, dict], config: AutoDecomposeConfig) -> List[Tuple[List[str], str]]:
+    """
+    Split the resources of a source into runs with their decomposition.
+
+    - Without any statistics, the source never ran: all resources keep the default "parallel-isolated".
+    - Resources without statistics after a recorded run loaded no rows, they count as 0 rows.
+    - When the previous run was shorter than `min_parallel_seconds`, all resources share one task.
+    - Otherwise, resources below `small_resource_rows` share one task and the others get a task each,
+      run "serial" if there is one of them and "parallel-isolated" otherwise.
+
+    Args:
+        resources (List[str]): Names of the selected resources, in source order.
+        stats (Dict[str, dict]): Statistics of the previous runs keyed by resource.
+        config (AutoDecomposeConfig): Thresholds of the planning.
+
+    Returns:
+        List[Tuple[List[str], str]]: Runs as (resource names, decompose mode).
+    """
+    if not any(resource in stats for resource in resources):
+        return [(resources, "parallel-isolated")]
+
+    if max(stats[resource]["duration"] for resource in resources if resource in stats) < config.min_parallel_seconds:
+        return [(resources, "none")]
+
+    small = [
+        resource for resource in resources
+        if stats.get(resource, {"rows": 0})["rows"] < config.small_resource_rows
+    ]
+    large = [resource for resource in resources if resource not in small]
+
+    runs = []
+    if small:
+        runs.append((small, "none"))
+    if large:
+        runs.append((large, "serial" if len(large) == 1 else "parallel-isolated"))
+    return runs
@@ -1,11 +1,15 @@
 """
 This module provides utilities to parse configurations from YAML files and
 to search for a particular configuration item within a directory of YAML files.
+Items are looked up through an index of the directory, kept up to date incrementally.
 """
+import copy
 import logging
 import os
-from typing import Any, Optional, Dict
-import yaml
+import time
+from typing import Any, Optional, Dict, List, Tuple
+
+from dag_factory.common.yaml_loader import load_config_file
 
 
 logger = logging.getLogger('airflow')
@@ -19,11 +23,130 @@ def _read_config(path: str) -> dict[str, Any]:
     :return: A dictionary with the parsed YAML file contents.
     """
     if os.path.exists(path):
-        with open(path, encoding='utf-8') as f:
-            return yaml.full_load(f)
-    else:
-        logger.info('File %s not found', path)
-        return None
+        return load_config_file(path)
+    logger.info('File %s not found', path)
+    return None
+
+
+class ConfigRepository:
+    """
+    Index of the configuration items of a directory of YAML configs, keyed by item name.
+
+    The index is built on first use and refreshed incrementally: a refresh walks the directory
+    and only re-reads the files whose modification time or size changed. Lookups of indexed
+    items only check the file they come from.
+
+    Attributes:
+        config_dir (str): Path to the configuration directory.
+        refresh_interval (float): Minimum number of seconds between two refreshes triggered by
+            unknown items.
+    """
+
+    EXTENSIONS = ('.yaml', '.yml')
+
+    def __init__(self, config_dir: str, refresh_interval: float = 30):
+        self.config_dir = config_dir
+        self.refresh_interval = refresh_interval
+        self._files: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+        self._index: Dict[str, str] = {}
+        self._refreshed_at: Optional[float] = None
+
+    def refresh(self):
+        """Update the index with the files added, changed or removed since the last refresh."""
+        seen = set()
+        changed = False
+        for root, dirs, files in os.walk(self.config_dir):
+            dirs.sort()
+            for file in sorted(files):
+                if not file.endswith(self.EXTENSIONS):
+                    continue
+                path = os.path.join(root, file)
+                seen.add(path)
+                changed |= self._load(path)
+
+        for path in set(self._files) - seen:
+            del self._files[path]
+            changed = True
+
+        if changed or self._refreshed_at is None:
+            self._index = {}
+            for path, (_, items) in self._files.items():
+                for item in items:
+                    if item in self._index:
+                        logger.warning('Item %s is defined in %s and %s', item, self._index[item], path)
+                        continue
+                    self._index[item] = path
+        self._refreshed_at = time.monotonic()
+
+    def path(self, item: str) -> Optional[str]:
+        """
+        Return the file defining a configuration item.
+
+        :param item: Specified configuration item.
+        :return: Path to the file, or None if the item is not defined.
+        """
+        if self._refreshed_at is None:
+            self.refresh()
+        path = self._index.get(item)
+        if path is not None and self._load(path):
+            # The file changed since it was indexed
+            self.refresh()
+            path = self._index.get(item)
+        if path is None and time.monotonic() - self._refreshed_at >= self.refresh_interval:
+            self.refresh()
+            path = self._index.get(item)
+        return path
+
+    def get(self, item: str) -> Optional[Dict]:
+        """
+        Return a configuration item.
+
+        :param item: Specified configuration item.
+        :return: A copy of the configuration of the item if it is found, else None.
+        """
+        path = self.path(item)
+        if path is None:
+            return None
+        return copy.deepcopy(self._files[path][1].get(item))
+
+    def items(self) -> List[str]:
+        """Return the names of all the configuration items."""
+        if self._refreshed_at is None:
+            self.refresh()
+        return list(self._index)
+
+    def _load(self, path: str) -> bool:
+        """Read a file if it is new or changed, and return whether it was."""
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return self._files.pop(path, None) is not None
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if path in self._files and self._files[path][0] == signature:
+            return False
+
+        config = _read_config(path)
+        items = config.get("dags") if isinstance(config, dict) else None
+        if not isinstance(items, dict):
+            logger.info('Skipping %s without dags', path)
+            items = {}
+        self._files[path] = (signature, items)
+        return True
+
+
+_repositories: Dict[str, ConfigRepository] = {}
+
+
+def get_repository(config_dir: str) -> ConfigRepository:
+    """
+    Return the process-wide configuration repository of a directory.
+
+    :param config_dir: Path to the configuration directory.
+    :return: The repository shared by all callers using the same directory.
+    """
+    if config_dir not in _repositories:
+        _repositories[config_dir] = ConfigRepository(config_dir)
+    return _repositories[config_dir]
 
 
 def _search_in_all_yaml_configs(item: str, config_dir: str) -> Optional[Dict]:
@@ -34,11 +157,4 @@ def _search_in_all_yaml_configs(item: str, config_dir: str) -> Optional[Dict]:
     :param config_dir: Path to the configuration directory.
     :return: A dictionary with the parsed YAML file contents if the item is found, else None.
     """
-    for root, _, files in os.walk(config_dir):
-        for file in files:
-            if file.endswith('.yaml'):
-                config_path = os.path.join(root, file)
-                config = _read_config(config_path)
-                if item in config["dags"]:
-                    return config["dags"][item]
-    return None
+    return get_repository(config_dir).get(item)
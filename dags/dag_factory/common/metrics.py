@@ -0,0 +1,230 @@
+"""
+This module provides the parse-time metrics of the DAG factory.
+
+Timings, counters and gauges are recorded in memory while DAGs are generated and handed to an
+exporter once per parse, so recording costs a `perf_counter` call and a list append. Samples
+follow the StatsD model (name, value, type and tags); the exporters write them as StatsD lines
+to a file or a StatsD/OpenTelemetry collector, or push them to a VictoriaMetrics endpoint in
+the Prometheus text format. Exporting never fails the parse and delays it by a bounded time: a
+misconfigured exporter discards the samples and HTTP pushes are awaited for at most a second.
+"""
+import logging
+import re
+import socket
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger('airflow')
+
+METRICS_PREFIX = 'dag_factory'
+
+
+class Sample(NamedTuple):
+    """A recorded metric value. `kind` is the StatsD type: `ms` (timing), `c` (counter) or `g` (gauge)."""
+    name: str
+    value: float
+    kind: str
+    tags: Tuple[Tuple[str, str], ...]
+
+
+class MetricsExporter:
+    """Base class of the metrics exporters, discarding the samples."""
+
+    def export(self, samples: List[Sample]):
+        """
+        Send the samples recorded during a parse.
+
+        Args:
+            samples (List[Sample]): Recorded samples, in recording order.
+        """
+
+
+def statsd_line(sample: Sample, prefix: str = METRICS_PREFIX) -> str:
+    """Format a sample as a StatsD line, with DogStatsD tags."""
+    line = f"{prefix}.{sample.name}:{sample.value:g}|{sample.kind}"
+    if sample.tags:
+        line += "|#" + ",".join(f"{key}:{value}" for key, value in sample.tags)
+    return line
+
+
+class FileExporter(MetricsExporter):
+    """
+    Appends the samples as StatsD lines to a local file, for tests and local runs.
+
+    Attributes:
+        path (str): File the lines are appended to.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, samples: List[Sample]):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.writelines(f"{statsd_line(sample)}\n" for sample in samples)
+
+
+class StatsdExporter(MetricsExporter):
+    """
+    Sends the samples as StatsD lines over UDP, e.g. to a StatsD server or an OpenTelemetry collector
+    with the StatsD receiver.
+
+    Attributes:
+        address (Tuple[str, int]): Host and port of the StatsD endpoint.
+        max_packet_size (int): Maximum size of a datagram, lines are batched up to it.
+    """
+
+    def __init__(self, host: str, port: int = 8125, max_packet_size: int = 1432):
+        self.address = (host, port)
+        self.max_packet_size = max_packet_size
+
+    def export(self, samples: List[Sample]):
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            packet = b""
+            for sample in samples:
+                line = statsd_line(sample).encode('utf-8')
+                if packet and len(packet) + len(line) + 1 > self.max_packet_size:
+                    sock.sendto(packet, self.address)
+                    packet = b""
+                packet = packet + b"\n" + line if packet else line
+            if packet:
+                sock.sendto(packet, self.address)
+
+
+def _escape_label(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class VictoriaMetricsExporter(MetricsExporter):
+    """
+    Pushes the samples to the Prometheus import API of a VictoriaMetrics endpoint.
+
+    Timings are pushed in seconds with a `_seconds` suffix, counters with a `_total` suffix. The push
+    runs in a daemon thread joined for at most `join_timeout` seconds: short-lived processes do not
+    exit before it completes, and an unresponsive endpoint (including its DNS resolution, which the
+    socket timeout does not bound) delays the parse by that much at most. Failures are only logged.
+
+    Attributes:
+        url (str): Base URL of VictoriaMetrics (or vminsert), e.g. `http://victoria:8428`.
+        timeout (float): Seconds to wait for the endpoint.
+        join_timeout (float): Seconds to wait for the push to complete.
+    """
+
+    IMPORT_PATH = '/api/v1/import/prometheus'
+
+    def __init__(self, url: str, timeout: float = 1, join_timeout: float = 1):
+        self.url = url.rstrip('/') + self.IMPORT_PATH
+        self.timeout = timeout
+        self.join_timeout = join_timeout
+
+    @staticmethod
+    def _line(sample: Sample, timestamp_ms: int) -> str:
+        name = re.sub(r'[^A-Za-z0-9_]', '_', f"{METRICS_PREFIX}.{sample.name}")
+        value = sample.value
+        if sample.kind == 'ms':
+            name, value = f"{name}_seconds", value / 1000
+        elif sample.kind == 'c':
+            name = f"{name}_total"
+        labels = ",".join(f'{key}="{_escape_label(label)}"' for key, label in sample.tags)
+        return f"{name}{{{labels}}} {value:g} {timestamp_ms}" if labels else f"{name} {value:g} {timestamp_ms}"
+
+    def export(self, samples: List[Sample]):
+        timestamp_ms = int(time.time() * 1000)
+        body = "".join(f"{self._line(sample, timestamp_ms)}\n" for sample in samples).encode('utf-8')
+        push = threading.Thread(target=self._push, args=(body, len(samples)), daemon=True,
+                                name='dag_factory_metrics')
+        push.start()
+        push.join(self.join_timeout)
+        if push.is_alive():
+            logger.warning('Pushing %d DAG factory metrics to %s takes more than %ss, not waiting for it',
+                           len(samples), self.url, self.join_timeout)
+
+    def _push(self, body: bytes, count: int):
+        request = urllib.request.Request(self.url, data=body, method='POST', headers={'Content-Type': 'text/plain'})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout):  # nosec B310
+                pass
+        except Exception as e:  # pylint: disable=W0718
+            logger.warning('Unable to push %d DAG factory metrics to %s: %s', count, self.url, e)
+
+
+class Metrics:
+    """
+    In-memory recorder of the parse-time metrics.
+
+    Attributes:
+        exporter (MetricsExporter): Exporter receiving the samples on `flush`.
+        samples (List[Sample]): Samples recorded since the last flush.
+    """
+
+    def __init__(self, exporter: Optional[MetricsExporter] = None):
+        self.exporter = exporter or MetricsExporter()
+        self.samples: List[Sample] = []
+
+    def timing(self, name: str, milliseconds: float, **tags):
+        """Record a duration in milliseconds."""
+        self.samples.append(Sample(name, milliseconds, 'ms', tuple(tags.items())))
+
+    def incr(self, name: str, value: float = 1, **tags):
+        """Record a counter increment."""
+        self.samples.append(Sample(name, value, 'c', tuple(tags.items())))
+
+    def gauge(self, name: str, value: float, **tags):
+        """Record the current value of a gauge."""
+        self.samples.append(Sample(name, value, 'g', tuple(tags.items())))
+
+    @contextmanager
+    def timer(self, name: str, **tags) -> Iterator[None]:
+        """Record the duration of the block, whether it raises or not."""
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timing(name, (time.perf_counter() - started_at) * 1000, **tags)
+
+    def totals(self, kind: str = 'ms') -> Dict[str, float]:
+        """Return the sum of the recorded values of a kind by metric name."""
+        totals: Dict[str, float] = {}
+        for sample in self.samples:
+            if sample.kind == kind:
+                totals[sample.name] = totals.get(sample.name, 0) + sample.value
+        return totals
+
+    def flush(self):
+        """Hand the recorded samples to the exporter and forget them. Export errors are only logged."""
+        samples, self.samples = self.samples, []
+        if not samples:
+            return
+        try:
+            self.exporter.export(samples)
+        except Exception as e:  # pylint: disable=W0718
+            logger.warning('Unable to export %d DAG factory metrics with %s: %s',
+                           len(samples), type(self.exporter).__name__, e)
+
+
+def build_exporter(constants) -> MetricsExporter:
+    """
+    Build the exporter selected by `constants.METRICS_EXPORTER`. A misconfigured exporter is logged
+    and replaced by the discarding one, so that metrics never fail the parse.
+
+    Args:
+        constants: Factory constants, `METRICS_EXPORTER` being one of "file", "statsd", "victoria"
+            or empty to discard the metrics.
+
+    Returns:
+        MetricsExporter: The configured exporter.
+    """
+    kind = getattr(constants, "METRICS_EXPORTER", "")
+    if kind == "file":
+        return FileExporter(constants.METRICS_FILE_PATH)
+    if kind == "statsd":
+        return StatsdExporter(constants.STATSD_HOST, constants.STATSD_PORT)
+    if kind == "victoria":
+        if constants.VICTORIA_URL:
+            return VictoriaMetricsExporter(constants.VICTORIA_URL)
+        logger.warning('VICTORIA_URL is not set, DAG factory metrics are discarded')
+    elif kind:
+        logger.warning('Unknown DAG factory metrics exporter %r, metrics are discarded', kind)
+    return MetricsExporter()
@@ -4,13 +4,93 @@ from datetime import timedelta
 from typing import Any, Optional, List, Dict, Union
 from functools import partial
 import pendulum
-from airflow.models import Variable
 from airflow.datasets import Dataset
 from pydantic.v1 import BaseModel, root_validator
 
-from dag_factory.common.utils import get_var
+from dag_factory.common.variables import get_variable
 
-ENV = Variable.get("env",  "development")
+class ChunkedConfig(BaseModel):
+    """
+    Configuration of the chunked streaming mode of a pipeline task.
+
+    The task runs the pipeline in successive windows, each extracted, normalized and loaded before
+    the next one starts, until a window loads nothing. The size of a window is defined by the source
+    (e.g. one day for sources with a daily bookmark).
+
+    Attributes:
+        max_windows (Optional[int]): Maximum number of windows run by the task (default: 100).
+        buffer_max_items (Optional[int]): Items buffered in memory by each writer before being flushed to
+            an intermediary file (default: 5000).
+        file_max_items (Optional[int]): Items after which intermediary files are rotated (default: 100000).
+        file_max_bytes (Optional[int]): Bytes after which intermediary files are rotated (default: None).
+    """
+    max_windows: Optional[int] = 100
+    buffer_max_items: Optional[int] = 5000
+    file_max_items: Optional[int] = 100000
+    file_max_bytes: Optional[int] = None
+
+
+class RuntimeConfig(BaseModel):
+    """
+    dlt runtime settings of the tasks of a pipeline.
+
+    Attributes:
+        extract_workers (Optional[int]): Threads extracting parallelized resources (default: None, dlt's default).
+        normalize_workers (Optional[int]): Processes normalizing the extracted files (default: None, dlt's
+            default of 1).
+        load_workers (Optional[int]): Threads loading files to the destination (default: None, dlt's default).
+        buffer_max_items (Optional[int]): Items buffered in memory by each writer before being flushed to a
+            file (default: None, dlt's default).
+
+    Root Validator:
+        validate_positive: A root validator checking that the settings are positive.
+    """
+    extract_workers: Optional[int] = None
+    normalize_workers: Optional[int] = None
+    load_workers: Optional[int] = None
+    buffer_max_items: Optional[int] = None
+
+    @root_validator
+    def validate_positive(cls, values):
+        """
+        Checks that the settings are positive.
+
+        Args:
+            values (dict): A dictionary of field names and their corresponding values.
+
+        Returns:
+            dict: The unchanged values.
+        """
+        for key, value in values.items():
+            if value is not None and value < 1:
+                raise ValueError(f"{key} must be positive, got {value}")
+        return values
+
+    def dlt_settings(self) -> Dict[str, Any]:
+        """
+        Returns the set dlt settings keyed by their config path with `__` separators.
+        """
+        settings = {
+            "extract__workers": self.extract_workers,
+            "normalize__workers": self.normalize_workers,
+            "load__workers": self.load_workers,
+            "data_writer__buffer_max_items": self.buffer_max_items,
+        }
+        return {key: value for key, value in settings.items() if value is not None}
+
+
+class AutoDecomposeConfig(BaseModel):
+    """
+    Thresholds used to plan the tasks of a source when `decompose` is "auto".
+
+    Attributes:
+        small_resource_rows (Optional[int]): Resources that loaded fewer rows in their previous run share a single
+            task (default: 10000).
+        min_parallel_seconds (Optional[int]): Sources whose previous run was shorter than this are loaded in a single
+            task (default: 300).
+    """
+    small_resource_rows: Optional[int] = 10000
+    min_parallel_seconds: Optional[int] = 300
 
 
 class PipelineTaskConfig(BaseModel):
@@ -19,6 +99,7 @@ class PipelineTaskConfig(BaseModel):
 
     Attributes:
         decompose (Optional[str]): The method used for task decomposition (default: "parallel-isolated").
+            "auto" picks it from the statistics of the previous runs, see `auto_decompose`.
         trigger_rule (Optional[str]): The rule used to trigger the task (default: "all_done").
         retries (Optional[int]): The number of times the task execution should be retried in case of failures
                                  (default: 0).
@@ -26,6 +107,12 @@ class PipelineTaskConfig(BaseModel):
                                           (default: True).
         queue (Optional[str]): Name of the queue where the task should be placed for execution (default: 'default').
         executor_config (Optional[Dict[str, Any]]): Task-specific configuration for the executor (default: None).
+        chunked (Optional[ChunkedConfig]): Run the task in chunked streaming mode instead of a single dlt run
+            (default: None).
+        auto_decompose (Optional[AutoDecomposeConfig]): Thresholds of the "auto" decomposition
+            (default: an instance of AutoDecomposeConfig).
+        runtime (Optional[RuntimeConfig]): dlt runtime settings of the task, overriding the ones of the
+            pipeline (default: None).
 
     Root Validator:
         validate_kubernetes_executor_config: A root validator that preprocesses inputs to validate and structure
@@ -38,6 +125,9 @@ class PipelineTaskConfig(BaseModel):
     provide_context: Optional[bool] = True
     queue: Optional[str] = 'default'
     executor_config: Optional[Dict[str, Any]] = None
+    chunked: Optional[ChunkedConfig] = None
+    auto_decompose: Optional[AutoDecomposeConfig] = AutoDecomposeConfig()
+    runtime: Optional[RuntimeConfig] = None
 
     @root_validator(pre=True)
     def validate_kubernetes_executor_config(cls, values):
@@ -68,6 +158,18 @@ class PipelineTaskConfig(BaseModel):
 
         return values
 
+    def add_run_kwargs(self) -> Dict[str, Any]:
+        """
+        Returns the arguments of `PipelineTasksGroup.add_run`, without the settings handled by the factory itself.
+        """
+        return self.dict(exclude={"chunked", "auto_decompose", "runtime"})
+
+    def operator_kwargs(self) -> Dict[str, Any]:
+        """
+        Returns the operator arguments of the tasks built by the factory itself, as `add_run` passes them.
+        """
+        return self.dict(exclude={"decompose", "provide_context", "chunked", "auto_decompose", "runtime"})
+
 
 class Task(BaseModel):
     """
@@ -133,6 +235,8 @@ class DependsOnItems(BaseModel):
         task_id: (Optional[str]): name of the task
         allowed_states: (Optional[List[str]]): acceptable states of sensor to continue the execution
         allowed_envs: (Optional[List[str]]): acceptable environments of sensor to adding it to the task group
+        deferrable: (Optional[bool]): release the worker slot and wait in the triggerer instead of `mode`.
+            Default is False
     """
     schedule: Optional[str] = None
     execution_timeout: Optional[pendulum.Duration] = pendulum.duration(minutes=60)
@@ -142,6 +246,7 @@ class DependsOnItems(BaseModel):
     task_id: Optional[str] = 'end'
     allowed_states: Optional[list] = ['success']
     allowed_envs: Optional[list] = ['prod', 'stage', 'development']
+    deferrable: Optional[bool] = False
 
     @root_validator(pre=True)
     def validate_time(cls, values):
@@ -188,12 +293,86 @@ class CommonConfig(BaseModel):
     """
     Common configuration for pipeline tasks.
 
+    With a `staging` destination, dlt writes the load files to the staging bucket and the
+    destination loads them with load jobs (e.g. BigQuery load jobs over Parquet files) instead of
+    inserting rows.
+
     Attributes:
         destination (Optional[str]): Destination for the pipeline (default: "bigquery").
         progress (Optional[str]): Progress logging method.
+        staging (Optional[str]): Staging destination, "filesystem" (default: None, no staging).
+        staging_bucket_url (Optional[str]): Bucket of the staging destination, e.g. `gs://bucket/dlt`, which
+            BigQuery requires, or `file:///tmp/dlt` for local destinations (default: None, read from the dlt
+            configuration, e.g. the `DESTINATION__FILESYSTEM__BUCKET_URL` environment variable set by Terraform
+            in Composer and by `DLT_STAGING_BUCKET_URL` in the local docker compose).
+        loader_file_format (Optional[str]): Format of the load files, "parquet" or "jsonl"
+            (default: None, the destination's preferred format).
+        file_max_items (Optional[int]): Items after which load files are rotated (default: None).
+        file_max_bytes (Optional[int]): Bytes after which load files are rotated (default: None).
+
+    Root Validator:
+        validate_load_path: A root validator checking the staging destination and the loader file format.
     """
     destination: Optional[str] = "bigquery"
     progress: Optional[str]
+    staging: Optional[str] = None
+    staging_bucket_url: Optional[str] = None
+    loader_file_format: Optional[str] = None
+    file_max_items: Optional[int] = None
+    file_max_bytes: Optional[int] = None
+
+    @root_validator
+    def validate_load_path(cls, values):
+        """
+        Checks the staging destination and the loader file format.
+
+        Args:
+            values (dict): A dictionary of field names and their corresponding values.
+
+        Returns:
+            dict: The unchanged values.
+        """
+        if values.get("staging") not in (None, "filesystem"):
+            raise ValueError(f"Unsupported staging destination: {values['staging']}")
+        if values.get("staging_bucket_url") and not values.get("staging"):
+            raise ValueError("staging_bucket_url requires a staging destination")
+        if values.get("loader_file_format") not in (None, "parquet", "jsonl"):
+            raise ValueError(f"Unsupported loader file format: {values['loader_file_format']}")
+        return values
+
+    def pipeline_kwargs(self) -> Dict[str, Any]:
+        """
+        Returns the arguments of `dlt.pipeline`, without the settings applied through the dlt configuration.
+        """
+        return self.dict(include={"destination", "progress", "staging"})
+
+    def dlt_settings(self) -> Dict[str, Any]:
+        """
+        Returns the dlt settings of the load path keyed by their config path with `__` separators,
+        to be applied with `dlt_runtime.dlt_env` when the task runs.
+        """
+        return {
+            "destination__filesystem__bucket_url": self.staging_bucket_url,
+            "normalize__loader_file_format": self.loader_file_format,
+            "data_writer__file_max_items": self.file_max_items,
+            "data_writer__file_max_bytes": self.file_max_bytes,
+        }
+
+
+class FanOutConfig(BaseModel):
+    """
+    Configuration of the fan-out mode of a pipeline with transformers.
+
+    Each source is extracted once into a staging area, as Parquet files written by the dlt
+    filesystem destination, and every transformer dataset is loaded from the staged files of
+    the run instead of extracting the source again. The staged source is built without a
+    `stream_name`, and each transformer loads the tables of the resources selected by its
+    stream, with their hints. `chunked` and `decompose` do not apply.
+
+    Attributes:
+        bucket_url (str): URL of the staging area, e.g. `gs://bucket/staging` or a local path.
+    """
+    bucket_url: str
 
 
 class Pipeline(BaseModel):
@@ -204,12 +383,17 @@ class Pipeline(BaseModel):
         common_config (Optional[CommonConfig]): Common configuration for the pipeline (default: CommonConfig).
         group_config (Optional[GroupConfig]): Group configuration for the pipeline (default: GroupConfig).
         tasks (List[Task]): List of tasks in the pipeline.
+        fan_out (Optional[FanOutConfig]): Extract each source once for all transformers (default: None).
+        runtime (Optional[RuntimeConfig]): dlt runtime settings of the tasks, see
+            `runtime.runtime_settings` (default: None).
     """
     pipeline_name: Optional[str] = None
     destination_name: Optional[str] = None
     common_config: Optional[CommonConfig] = CommonConfig()
     group_config: Optional[GroupConfig] = GroupConfig()
     tasks: List[Task]
+    fan_out: Optional[FanOutConfig] = None
+    runtime: Optional[RuntimeConfig] = None
 
 
 class DagConfig(BaseModel):
@@ -230,7 +414,7 @@ class DagConfig(BaseModel):
             (default: send_slack_notification_on_failure).
         is_paused_upon_creation:  (bool | None) – Specifies if the dag is paused when created for the first time.
             If the dag exists already, this flag will be ignored.
-            If this optional parameter is not specified, the global config setting will be used.
+            If this optional parameter is not specified, DAGs are paused outside of the 'prod' env Variable.
     """
     dag_id: str
     schedule: Optional[Union[str, list[Dataset]]] = None
@@ -242,7 +426,7 @@ class DagConfig(BaseModel):
     catchup: bool = False
     start_date: Any = pendulum.today("UTC").subtract(days=1)
     on_failure_callback: Any = None
-    is_paused_upon_creation: bool = ENV != 'prod'
+    is_paused_upon_creation: Optional[bool] = None
 
     class Config:
         arbitrary_types_allowed = True
@@ -251,7 +435,8 @@ class DagConfig(BaseModel):
     def validate_dataset_schedule(cls, values):
         """
         A root validation method for the 'schedule' attribute.
-        It converts a list of dataset strings into Dataset objects, each representing a distinct dataset.
+        It converts a list of dataset strings into Dataset objects, each representing a distinct dataset,
+        and defaults 'is_paused_upon_creation' from the resolved 'env' Variable.
 
         Args:
             cls: The class object. Required by Pydantic for root validators.
@@ -271,6 +456,9 @@ class DagConfig(BaseModel):
 
             values['schedule'] = dataset_schedule
 
+        if values.get('is_paused_upon_creation') is None:
+            values['is_paused_upon_creation'] = get_variable('env') != 'prod'
+
         return values
 
 
@@ -336,7 +524,7 @@ class Dag(BaseModel):
         if values.get('transformers') is not None:
             for item in values['transformers']:
                 values['transformers'][item]['name'] = (f"{values['transformers'][item]['name']}"
-                                                f"{'-stage' if get_var('env', -1) != 'prod' else ''}")
+                                                f"{'-stage' if get_variable('env') != 'prod' else ''}")
         return values
 
 
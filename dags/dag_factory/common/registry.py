@@ -0,0 +1,60 @@
+"""
+This module provides a registry of plugins imported on first use.
+
+Entries are registered by import path (`"package.module:attribute"`), so registering a DAG
+builder or a dlt source costs nothing: its module, and the libraries it depends on, are only
+imported when a configuration actually references it.
+"""
+import importlib
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Union
+
+
+def import_string(import_path: str) -> Any:
+    """
+    Import an object from its `"package.module:attribute"` path.
+
+    Args:
+        import_path (str): Import path of the object.
+
+    Returns:
+        Any: The imported object.
+    """
+    module_name, _, attribute = import_path.partition(':')
+    if not attribute:
+        raise ValueError(f"Import path {import_path} must be in the form 'package.module:attribute'")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+class LazyRegistry(Mapping):
+    """
+    Read-only mapping of names to plugins, imported when first looked up.
+
+    Membership tests and iteration never import anything.
+
+    Attributes:
+        entries (Dict[str, Union[str, Any]]): Import paths of the plugins keyed by name. Objects
+            that are already imported can be registered directly.
+    """
+
+    def __init__(self, entries: Dict[str, Union[str, Any]]):
+        self.entries = dict(entries)
+        self._loaded: Dict[str, Any] = {}
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self._loaded:
+            entry = self.entries[name]
+            self._loaded[name] = import_string(entry) if isinstance(entry, str) else entry
+        return self._loaded[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.entries!r})"
@@ -0,0 +1,93 @@
+"""
+This module sizes the dlt runtime settings of the pipeline tasks.
+
+Tasks on the "kubernetes" queue get settings sized from the CPU and memory requests of their
+executor config, which the runtime settings of the pipeline and of the task then override. The
+settings are keyed by their dlt config path with `__` separators, see `dlt_runtime.dlt_env`.
+"""
+import re
+from typing import Any, Dict, Optional
+
+MEMORY_UNITS = {
+    "Ki": 2 ** 10, "Mi": 2 ** 20, "Gi": 2 ** 30, "Ti": 2 ** 40,
+    "K": 10 ** 3, "M": 10 ** 6, "G": 10 ** 9, "T": 10 ** 12,
+}
+# dlt's default of `data_writer.buffer_max_items`, the floor of the sized buffers
+DLT_DEFAULT_BUFFER_MAX_ITEMS = 5000
+# Share of the requested memory given to the writer buffers when sized from the memory request; the
+# rest is left to the normalize processes themselves and to the writers of other tables
+BUFFER_MEMORY_SHARE = 0.25
+# Estimated size in memory of a buffered item: a wide row with nested fields (e.g. a GA4 event)
+BUFFER_BYTES_PER_ITEM = 10 * 2 ** 10
+
+_QUANTITY = re.compile(r"^(\d+(?:\.\d*)?|\.\d+)([A-Za-z]*)$")
+
+
+def _split_quantity(quantity: Any, kind: str):
+    """Split a Kubernetes quantity into its number and unit, raising ValueError if it is not one."""
+    match = _QUANTITY.match(str(quantity).strip())
+    if not match:
+        raise ValueError(f"Invalid {kind} quantity: {quantity!r}")
+    return float(match.group(1)), match.group(2)
+
+
+def parse_cpu(quantity: Any) -> float:
+    """Convert a Kubernetes CPU quantity (e.g. "500m", "2") to cores, raising ValueError if it is invalid."""
+    number, unit = _split_quantity(quantity, "CPU")
+    if unit == "m":
+        return number / 1000
+    if unit:
+        raise ValueError(f"Invalid CPU quantity: {quantity!r}")
+    return number
+
+
+def parse_memory(quantity: Any) -> int:
+    """Convert a Kubernetes memory quantity (e.g. "512Mi", "4G") to bytes, raising ValueError if it is invalid."""
+    number, unit = _split_quantity(quantity, "memory")
+    if unit and unit not in MEMORY_UNITS:
+        raise ValueError(f"Invalid memory quantity: {quantity!r}")
+    return int(number * MEMORY_UNITS.get(unit, 1))
+
+
+def sized_settings(queue: Optional[str], executor_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Returns the dlt settings sized from the CPU and memory requests of a task on the "kubernetes" queue.
+
+    Normalize runs one process per requested core. The writers get `BUFFER_MEMORY_SHARE` of the requested
+    memory, shared by the normalize processes, and buffer as many items of `BUFFER_BYTES_PER_ITEM` as it
+    holds, but never fewer than dlt's default. Other tasks get dlt's defaults.
+
+    Args:
+        queue (Optional[str]): Queue of the task.
+        executor_config (Optional[Dict[str, Any]]): Executor config of the task, with the requests under
+            the "KubernetesExecutor" key.
+    """
+    if queue != "kubernetes" or not executor_config:
+        return {}
+    resources = executor_config.get("KubernetesExecutor", {})
+    settings = {}
+    normalize_workers = None
+    if resources.get("request_cpu"):
+        normalize_workers = max(1, int(parse_cpu(resources["request_cpu"])))
+        settings["normalize__workers"] = normalize_workers
+    if resources.get("request_memory"):
+        buffer_bytes = parse_memory(resources["request_memory"]) * BUFFER_MEMORY_SHARE / (normalize_workers or 1)
+        settings["data_writer__buffer_max_items"] = max(DLT_DEFAULT_BUFFER_MAX_ITEMS,
+                                                        int(buffer_bytes / BUFFER_BYTES_PER_ITEM))
+    return settings
+
+
+def runtime_settings(run_parameters, pipeline_runtime=None) -> Dict[str, Any]:
+    """
+    Returns the dlt runtime settings of a task: the sized defaults, overridden by the settings of the
+    pipeline, overridden by the settings of the task.
+
+    Args:
+        run_parameters (PipelineTaskConfig): Configuration of the task.
+        pipeline_runtime (Optional[RuntimeConfig]): Runtime settings of the pipeline.
+    """
+    settings = sized_settings(run_parameters.queue, run_parameters.executor_config)
+    for runtime in (pipeline_runtime, run_parameters.runtime):
+        if runtime is not None:
+            settings.update(runtime.dlt_settings())
+    return settings
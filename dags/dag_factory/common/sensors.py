@@ -0,0 +1,199 @@
+"""
+This module provides a deferrable sensor waiting for upstream DAG runs through a shared watcher.
+
+Deferred sensors release their worker slot and hand the wait over to the triggerer. Inside a
+triggerer process, all waits on the same upstream DAG run are served by a single watcher, which
+checks the state of the run and of every awaited task with one metadata query per interval,
+instead of one query per sensor.
+"""
+import asyncio
+import datetime
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from airflow.exceptions import AirflowException
+from airflow.sensors.external_task import ExternalTaskSensor
+from airflow.triggers.base import BaseTrigger, TriggerEvent
+from asgiref.sync import sync_to_async
+
+logger = logging.getLogger('airflow')
+
+
+def _fetch_states(dag_id: str, execution_date: datetime.datetime,
+                  task_ids: Set[str]) -> Tuple[Optional[str], Dict[str, str]]:
+    """
+    Read the state of a DAG run and of some of its tasks with a single query.
+
+    Returns:
+        Tuple[Optional[str], Dict[str, str]]: State of the run, or None if it does not exist yet, and
+            states of the tasks keyed by task id.
+    """
+    from airflow.models import DagRun, TaskInstance  # pylint: disable=C0415
+    from airflow.utils.session import create_session  # pylint: disable=C0415
+    from sqlalchemy import and_  # pylint: disable=C0415
+
+    with create_session() as session:
+        rows = (
+            session.query(DagRun.state, TaskInstance.task_id, TaskInstance.state)
+            .outerjoin(
+                TaskInstance,
+                and_(
+                    TaskInstance.dag_id == DagRun.dag_id,
+                    TaskInstance.run_id == DagRun.run_id,
+                    TaskInstance.task_id.in_(task_ids),
+                ),
+            )
+            .filter(DagRun.dag_id == dag_id, DagRun.execution_date == execution_date)
+            .all()
+        )
+    if not rows:
+        return None, {}
+    return rows[0][0], {task_id: state for _, task_id, state in rows if task_id is not None}
+
+
+class _RunWatcher:
+    """
+    Polls the states awaited by all the triggers waiting on one upstream DAG run.
+
+    Attributes:
+        dag_id (str): Id of the upstream DAG.
+        execution_date (datetime.datetime): Logical date of the upstream DAG run.
+        poll_interval (float): Seconds between two checks, the shortest interval of the waiters.
+    """
+
+    def __init__(self, dag_id: str, execution_date: datetime.datetime, poll_interval: float):
+        self.dag_id = dag_id
+        self.execution_date = execution_date
+        self.poll_interval = poll_interval
+        self._waiters: List[Tuple[Optional[str], Set[str], asyncio.Future]] = []
+        self._poller: Optional[asyncio.Task] = None
+
+    def wait(self, task_id: Optional[str], allowed_states: List[str], poll_interval: float) -> asyncio.Future:
+        """
+        Register a wait for a task, or for the run itself when `task_id` is None.
+
+        Returns:
+            asyncio.Future: Future resolved with the state once it is one of `allowed_states`.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append((task_id, set(allowed_states), future))
+        self.poll_interval = min(self.poll_interval, poll_interval)
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.create_task(self._poll())
+        return future
+
+    async def _poll(self):
+        try:
+            while True:
+                # Waits of cancelled triggers are dropped along with the resolved ones
+                self._waiters = [waiter for waiter in self._waiters if not waiter[2].done()]
+                if not self._waiters:
+                    return
+
+                task_ids = {task_id for task_id, _, _ in self._waiters if task_id is not None}
+                try:
+                    run_state, task_states = await sync_to_async(_fetch_states)(
+                        self.dag_id, self.execution_date, task_ids
+                    )
+                except Exception as e:  # pylint: disable=W0718
+                    for _, _, future in self._waiters:
+                        if not future.done():
+                            future.set_exception(e)
+                    return
+
+                for task_id, allowed_states, future in self._waiters:
+                    state = run_state if task_id is None else task_states.get(task_id)
+                    if state in allowed_states and not future.done():
+                        future.set_result(state)
+
+                logger.debug('Waiting on %s run %s for %s tasks', self.dag_id, self.execution_date,
+                             len(self._waiters))
+                await asyncio.sleep(self.poll_interval)
+        finally:
+            if _watchers.get((self.dag_id, self.execution_date)) is self:
+                del _watchers[(self.dag_id, self.execution_date)]
+
+
+# Watchers of the current triggerer process, keyed by upstream DAG run
+_watchers: Dict[Tuple[str, datetime.datetime], _RunWatcher] = {}
+
+
+class ExternalRunTrigger(BaseTrigger):
+    """
+    Fires when a task of an upstream DAG run, or the run itself, reaches one of the allowed states.
+
+    Attributes:
+        external_dag_id (str): Id of the upstream DAG.
+        external_task_id (Optional[str]): Id of the awaited task, None to wait for the whole run.
+        execution_date (datetime.datetime): Logical date of the upstream DAG run.
+        allowed_states (List[str]): States ending the wait.
+        poll_interval (float): Seconds between two checks.
+    """
+
+    def __init__(
+        self,
+        external_dag_id: str,
+        external_task_id: Optional[str],
+        execution_date: datetime.datetime,
+        allowed_states: List[str],
+        poll_interval: float = 60,
+    ):
+        super().__init__()
+        self.external_dag_id = external_dag_id
+        self.external_task_id = external_task_id
+        self.execution_date = execution_date
+        self.allowed_states = allowed_states
+        self.poll_interval = poll_interval
+
+    def serialize(self) -> Tuple[str, Dict[str, Any]]:
+        return (
+            f"{self.__class__.__module__}.{self.__class__.__name__}",
+            {
+                "external_dag_id": self.external_dag_id,
+                "external_task_id": self.external_task_id,
+                "execution_date": self.execution_date,
+                "allowed_states": self.allowed_states,
+                "poll_interval": self.poll_interval,
+            },
+        )
+
+    async def run(self) -> AsyncIterator[TriggerEvent]:
+        key = (self.external_dag_id, self.execution_date)
+        if key not in _watchers:
+            _watchers[key] = _RunWatcher(self.external_dag_id, self.execution_date, self.poll_interval)
+        try:
+            state = await _watchers[key].wait(self.external_task_id, self.allowed_states, self.poll_interval)
+        except Exception as e:  # pylint: disable=W0718
+            yield TriggerEvent({"status": "error", "message": str(e)})
+            return
+        yield TriggerEvent({"status": "success", "state": state})
+
+
+class BatchedExternalTaskSensor(ExternalTaskSensor):
+    """
+    `ExternalTaskSensor` deferring to an `ExternalRunTrigger` when the upstream is not done yet.
+
+    The upstream DAG run is the one sharing the sensor's logical date, like the default
+    `ExternalTaskSensor` behaviour.
+    """
+
+    def execute(self, context: Dict[str, Any]):
+        if self.poke(context):
+            return
+        self.defer(
+            trigger=ExternalRunTrigger(
+                external_dag_id=self.external_dag_id,
+                external_task_id=self.external_task_id,
+                execution_date=context["logical_date"],
+                allowed_states=list(self.allowed_states),
+                poll_interval=self.poke_interval,
+            ),
+            method_name="execute_complete",
+            timeout=datetime.timedelta(seconds=self.timeout),
+        )
+
+    def execute_complete(self, context: Dict[str, Any], event: Optional[Dict[str, Any]] = None):
+        """Resume the sensor once the trigger fired."""
+        if not event or event.get("status") != "success":
+            raise AirflowException(f"Error while waiting for {self.external_dag_id}: {event}")
+        logger.info('%s.%s reached %s', self.external_dag_id, self.external_task_id, event.get("state"))
@@ -0,0 +1,185 @@
+"""
+This module provides a compiled snapshot of parsed and validated DAG configurations.
+
+Every scheduler parse loop and every task process used to re-read, re-parse and re-validate
+all YAML configs. The snapshot stores the result of that work for every config file in a single
+binary index keyed by file path, modification time and content hash, so that later parses only
+reload the files that actually changed.
+
+The snapshot is unpickled, so it is only read from, and written to, a directory owned by the
+current user and not writable by others.
+"""
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from dag_factory.common.metrics import Metrics
+
+logger = logging.getLogger('airflow')
+
+SNAPSHOT_VERSION = 1
+
+
+def _is_private(path: str) -> bool:
+    """Return whether a path is owned by the current user and not writable by group or others."""
+    stat = os.stat(path)
+    return stat.st_uid == os.getuid() and not stat.st_mode & 0o022
+
+
+class ConfigSnapshot:
+    """
+    Binary index of compiled configuration files.
+
+    Each entry is stored under the absolute path of the config file together with its
+    `(mtime_ns, size)` signature and the sha256 of its content. An unchanged signature is a hit
+    without reading the file; a changed signature with an unchanged hash is a hit after a single read.
+
+    Attributes:
+        path (Optional[str]): Location of the snapshot file. The snapshot is kept in memory only if None.
+        key (str): Discriminator of the compiled content (e.g. environment and models version).
+            A stored snapshot with a different key is discarded.
+        hits (int): Number of files served from the snapshot.
+        misses (int): Number of files that had to be compiled.
+        metrics (Optional[Metrics]): Recorder of the file read timings, if any.
+    """
+
+    def __init__(self, path: Optional[str], key: str = "", metrics: Optional[Metrics] = None):
+        self.path = path
+        self.key = key
+        self.metrics = metrics
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, Tuple[Tuple[int, int], str, Any]] = {}
+        self._seen = set()
+        self._dirty = False
+        self._loaded = False
+
+    def _read(self):
+        """Load the stored snapshot on first use, ignoring missing, corrupted or foreign files."""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path:
+            return
+        try:
+            if not (_is_private(self.path) and _is_private(os.path.dirname(self.path) or '.')):
+                logger.warning('Ignoring DAG snapshot %s, it is not private to the current user', self.path)
+                return
+            with open(self.path, 'rb') as f:
+                header, entries = pickle.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:  # pylint: disable=W0718
+            logger.warning('Discarding unreadable DAG snapshot %s: %s', self.path, e)
+            return
+        if header == (SNAPSHOT_VERSION, self.key):
+            self._entries = entries
+
+    def get(self, file_path: str, compile_fn: Callable[[bytes], Any]) -> Any:
+        """
+        Return the compiled content of a config file, compiling it only if it changed.
+
+        Args:
+            file_path (str): Path to the configuration file.
+            compile_fn (Callable[[bytes], Any]): Function turning raw file content into the compiled value.
+                The value must be picklable.
+
+        Returns:
+            Any: The compiled value of the file.
+        """
+        return self.get_many([file_path], compile_fn)[0]
+
+    def get_many(self, file_paths: List[str], compile_fn: Callable[[bytes], Any],
+                 map_fn: Callable = map, on_compiled: Optional[Callable[[str, Any], Any]] = None) -> List[Any]:
+        """
+        Return the compiled content of several config files, compiling only the changed ones.
+
+        Args:
+            file_paths (List[str]): Paths to the configuration files.
+            compile_fn (Callable[[bytes], Any]): Function turning raw file content into the compiled value.
+                The value must be picklable.
+            map_fn (Callable): Order-preserving map used to compile the changed files, e.g. `Executor.map`
+                to compile them concurrently (default: the builtin map).
+            on_compiled (Optional[Callable[[str, Any], Any]]): Called in this process with the path and
+                the result of every compiled file, and returning the value to store.
+
+        Returns:
+            List[Any]: The compiled values, in the order of `file_paths`.
+        """
+        self._read()
+        values = [None] * len(file_paths)
+        changed = []
+
+        for position, requested_path in enumerate(file_paths):
+            file_path = os.path.abspath(requested_path)
+            self._seen.add(file_path)
+            stat = os.stat(file_path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+
+            entry = self._entries.get(file_path)
+            if entry is not None and entry[0] == signature:
+                self.hits += 1
+                values[position] = entry[2]
+                continue
+
+            started_at = time.perf_counter()
+            with open(file_path, 'rb') as f:
+                content = f.read()
+            if self.metrics is not None:
+                self.metrics.timing("config.read", (time.perf_counter() - started_at) * 1000, file=requested_path)
+            digest = hashlib.sha256(content).hexdigest()
+
+            if entry is not None and entry[1] == digest:
+                self.hits += 1
+                self._entries[file_path] = (signature, digest, entry[2])
+                self._dirty = True
+                values[position] = entry[2]
+            else:
+                self.misses += 1
+                changed.append((position, file_path, signature, digest, content))
+
+        compiled = map_fn(compile_fn, [content for *_, content in changed]) if changed else []
+        for (position, file_path, signature, digest, _), value in zip(changed, compiled):
+            if on_compiled is not None:
+                value = on_compiled(file_paths[position], value)
+            self._entries[file_path] = (signature, digest, value)
+            self._dirty = True
+            values[position] = value
+        return values
+
+    def save(self, prune: bool = False):
+        """
+        Persist the snapshot if anything changed, replacing the stored file atomically.
+
+        Args:
+            prune (bool): Drop entries of files that were not requested since the snapshot was loaded.
+                Should only be set after a full scan of the config directory.
+        """
+        if not self._loaded:
+            return
+        if prune:
+            for file_path in set(self._entries) - self._seen:
+                del self._entries[file_path]
+                self._dirty = True
+
+        if not self.path or not self._dirty:
+            return
+
+        directory = os.path.dirname(self.path) or '.'
+        try:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            if not _is_private(directory):
+                logger.warning('Not storing DAG snapshot in %s, the directory is not private to the current user',
+                               directory)
+                return
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.snapshot-')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(((SNAPSHOT_VERSION, self.key), self._entries), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except Exception as e:  # pylint: disable=W0718
+            logger.warning('Unable to store DAG snapshot %s: %s', self.path, e)
@@ -1,9 +1,16 @@
 """Default tasks"""
+from typing import Dict, Optional
+
 from airflow.operators.empty import EmptyOperator
 from airflow.models import BaseOperator
 from airflow.datasets import Dataset
+from airflow.sensors.external_task import ExternalTaskSensor
+from airflow.utils.task_group import TaskGroup
 from airflow.utils.trigger_rule import TriggerRule
 
+from dag_factory.common.models import DependsOnItems
+from dag_factory.common.sensors import BatchedExternalTaskSensor
+
 
 def start_task() -> BaseOperator:
     """
@@ -48,3 +55,39 @@ def end_task(dag_id=None, trigger_rule=TriggerRule.ALL_SUCCESS) -> BaseOperator:
         outlets=[Dataset(f"bigquery://{dag_id}")],
         trigger_rule=trigger_rule,
     )
+
+
+def waiters_group(depends_on: Optional[Dict[str, DependsOnItems]], airflow_env: str) -> Optional[TaskGroup]:
+    """
+    Generates the sensors waiting for the upstream DAGs a DAG depends on.
+
+    Deferrable dependencies release their worker slot while waiting: the wait is handed over to the
+    triggerer, where all the waits on the same upstream DAG run share a single status check.
+
+    :param depends_on: The upstream DAGs keyed by DAG id, with their sensor parameters.
+    :param airflow_env: The current Airflow environment. Dependencies not allowed in it are skipped.
+    :return: A TaskGroup with one sensor per upstream DAG, or None if there is nothing to wait for.
+    """
+    depends_on = {
+        dag_id: params
+        for dag_id, params in (depends_on or {}).items()
+        if airflow_env in params.allowed_envs
+    }
+    if not depends_on:
+        return None
+
+    with TaskGroup("waiters", tooltip="Sensor tasks") as sensor_group:
+        for depends_on_dag_id, depends_on_params in depends_on.items():
+            sensor_class = BatchedExternalTaskSensor if depends_on_params.deferrable else ExternalTaskSensor
+            sensor_class(
+                task_id=depends_on_dag_id,
+                external_dag_id=depends_on_dag_id,
+                mode=depends_on_params.mode,
+                poke_interval=depends_on_params.poke_interval,
+                allowed_states=depends_on_params.allowed_states,
+                external_task_id=depends_on_params.task_id,
+                timeout=depends_on_params.timeout,
+                execution_timeout=depends_on_params.execution_timeout,
+                retries=0,
+            )
+    return sensor_group
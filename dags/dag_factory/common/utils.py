@@ -4,13 +4,12 @@ import logging
 import subprocess
 from typing import Callable, Any, Optional
 import json
-from time import time
 from os import path
-from pickle import dump, load
 
 from airflow.models import Variable
 
-from dag_factory.common.constants import ENV
+from dag_factory.common.cache import get_cache
+from dag_factory.common.constants import ENV, VARIABLE_CACHE_PATH
 
 logger = logging.getLogger('airflow')
 
@@ -24,25 +23,22 @@ def get_with_cache(fn: Callable = None, cache_path: str = None, expire_at_sec: i
     default 1 day (86400 seconds), cache will be refreshed eventually after, but before this number
     :param cache_path: a string which is a file path to store the pickled object as a disk-based cache
     :return: the results of whichever function is given as "fn"
+
+    The value is stored in the file `cache_path` itself, written atomically and refreshed by a
+    single process at a time, see `DiskCache`.
     """
 
     if cache_path is None or fn is None:
         raise RuntimeError("Function and cache path required, cache failed to load!")
-    if expire_at_sec < 0 and path.isfile(cache_path):
-        return load(open(cache_path, 'rb'))
-    if expire_at_sec > 0 and path.isfile(cache_path) and int(time() - path.getmtime(cache_path)) < expire_at_sec:
-        return load(open(cache_path, 'rb'))
-    results = fn(*args, **kwargs)
-    with open(cache_path, 'wb') as f:
-        dump(results, f)
-    return results
+    cache_dir, filename = path.split(path.abspath(cache_path))
+    return get_cache(cache_dir, exact_names=True).get(filename, fn, expire_at_sec, *args, **kwargs)
 
 
 def get_var(name: str, expire_at_sec: int, default_value: Any = None) -> Any:
-    return get_with_cache(
+    return get_cache(VARIABLE_CACHE_PATH).get(
+        name,
         Variable.get,
-        f"{name}.cache",
-        expire_at_sec=expire_at_sec,
+        expire_at_sec,
         key=name,
         default_var=default_value,
     )
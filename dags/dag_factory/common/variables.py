@@ -0,0 +1,184 @@
+"""
+This module resolves the Airflow Variables needed while validating DAG configurations.
+
+Variables are resolved once per parse, in a single batch, through a pluggable chain of
+resolvers (environment variables, disk cache, metadata DB), and bound for the duration of the
+validation. Importing the models therefore never opens a metadata DB connection.
+"""
+import hashlib
+import os
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from dag_factory.common.cache import DiskCache, get_cache
+from dag_factory.common.constants import VARIABLE_CACHE_EXPIRE_SEC, VARIABLE_CACHE_PATH
+
+# Variables used by the models, with their defaults
+MODEL_VARIABLES = {
+    "env": "development",
+}
+
+_bound_variables: ContextVar[Optional[Dict[str, Any]]] = ContextVar("dag_factory_variables", default=None)
+
+
+class VariableResolver(ABC):
+    """Base class of the Variable resolvers."""
+
+    @abstractmethod
+    def get_many(self, names: List[str]) -> Dict[str, Any]:
+        """
+        Look up several Variables at once.
+
+        Args:
+            names (List[str]): Names of the Variables.
+
+        Returns:
+            Dict[str, Any]: Values of the Variables that were found.
+        """
+
+    def resolve(self, defaults: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Resolve Variables, falling back to defaults for the ones not found.
+
+        Args:
+            defaults (Dict[str, Any]): Default values keyed by Variable name.
+
+        Returns:
+            Dict[str, Any]: Values keyed by Variable name.
+        """
+        found = self.get_many(list(defaults))
+        return {name: found.get(name, default) for name, default in defaults.items()}
+
+
+class EnvVarResolver(VariableResolver):
+    """Resolves Variables from `AIRFLOW_VAR_<NAME>` environment variables, like the Airflow env backend."""
+
+    def get_many(self, names: List[str]) -> Dict[str, Any]:
+        return {
+            name: os.environ[f"AIRFLOW_VAR_{name.upper()}"]
+            for name in names
+            if f"AIRFLOW_VAR_{name.upper()}" in os.environ
+        }
+
+
+class DbResolver(VariableResolver):
+    """
+    Resolves Variables like `Variable.get`: from the configured secrets backends first (e.g. Secret
+    Manager), then from the metadata DB with a single query for the Variables they did not define.
+    """
+
+    def get_many(self, names: List[str]) -> Dict[str, Any]:
+        from airflow.configuration import ensure_secrets_loaded  # pylint: disable=C0415
+        from airflow.models import Variable  # pylint: disable=C0415
+        from airflow.secrets.metastore import MetastoreBackend  # pylint: disable=C0415
+        from airflow.utils.session import create_session  # pylint: disable=C0415
+
+        found = {}
+        for backend in ensure_secrets_loaded():
+            if isinstance(backend, MetastoreBackend):
+                continue
+            for name in names:
+                if name not in found:
+                    value = backend.get_variable(name)
+                    if value is not None:
+                        found[name] = value
+
+        missing = [name for name in names if name not in found]
+        if missing:
+            with create_session() as session:
+                rows = session.query(Variable).filter(Variable.key.in_(missing)).all()
+                found.update({row.key: row.val for row in rows})
+        return found
+
+
+class CachedResolver(VariableResolver):
+    """
+    Caches the batches looked up by another resolver on disk.
+
+    Attributes:
+        backend (VariableResolver): Resolver queried when the cached batch expired.
+        cache (DiskCache): Cache storing the batches.
+        expire_at_sec (int): Age in seconds after which a batch is looked up again.
+    """
+
+    def __init__(self, backend: VariableResolver, cache: DiskCache, expire_at_sec: int):
+        self.backend = backend
+        self.cache = cache
+        self.expire_at_sec = expire_at_sec
+
+    def get_many(self, names: List[str]) -> Dict[str, Any]:
+        names = sorted(names)
+        batch = hashlib.sha1("\0".join(names).encode("utf-8")).hexdigest()
+        return self.cache.get(f"variables-{batch}", self.backend.get_many, self.expire_at_sec, names)
+
+
+class ChainResolver(VariableResolver):
+    """
+    Looks up Variables in several resolvers, the first one defining a Variable wins.
+
+    Attributes:
+        resolvers (List[VariableResolver]): Resolvers in lookup order.
+    """
+
+    def __init__(self, resolvers: List[VariableResolver]):
+        self.resolvers = resolvers
+
+    def get_many(self, names: List[str]) -> Dict[str, Any]:
+        found = {}
+        for resolver in self.resolvers:
+            missing = [name for name in names if name not in found]
+            if not missing:
+                break
+            found.update(resolver.get_many(missing))
+        return found
+
+
+def default_resolver(cache: DiskCache, expire_at_sec: int) -> VariableResolver:
+    """
+    Build the default resolver: environment variables first, then the metadata DB through the disk cache.
+
+    Args:
+        cache (DiskCache): Cache storing the metadata DB lookups.
+        expire_at_sec (int): Age in seconds after which the metadata DB is queried again.
+
+    Returns:
+        VariableResolver: The resolver chain.
+    """
+    return ChainResolver([EnvVarResolver(), CachedResolver(DbResolver(), cache, expire_at_sec)])
+
+
+@contextmanager
+def bind_variables(variables: Dict[str, Any]):
+    """
+    Make resolved Variables available to the model validators in the current context.
+
+    Args:
+        variables (Dict[str, Any]): Resolved Variables keyed by name.
+    """
+    token = _bound_variables.set(variables)
+    try:
+        yield
+    finally:
+        _bound_variables.reset(token)
+
+
+def get_variable(name: str) -> Any:
+    """
+    Return a Variable bound with `bind_variables`.
+
+    Outside of a binding, the model Variables are resolved with the default resolver, which
+    keeps models usable on their own.
+
+    Args:
+        name (str): Name of the Variable, one of `MODEL_VARIABLES`.
+
+    Returns:
+        Any: The Variable value.
+    """
+    variables = _bound_variables.get()
+    if variables is None:
+        variables = default_resolver(get_cache(VARIABLE_CACHE_PATH), VARIABLE_CACHE_EXPIRE_SEC).resolve(MODEL_VARIABLES)
+        _bound_variables.set(variables)
+    return variables[name]
@@ -0,0 +1,130 @@
+"""
+This module loads the YAML configuration files of the factory.
+
+Every config path parses YAML through the same safe loader, backed by libyaml (`CSafeLoader`)
+when PyYAML was built with it, which produces the same objects as the pure-Python `SafeLoader`.
+Parsed files can also be stored in a binary sidecar (msgpack, or JSON when msgpack is not
+installed) regenerated whenever the YAML file changes. A sidecar is only written when it decodes
+back to exactly the parsed YAML, so configs using types it cannot represent are always parsed.
+
+The module only depends on PyYAML, so that standalone tools can use it outside of Airflow.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from typing import Any, Optional, Tuple
+
+import yaml
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+logger = logging.getLogger('airflow')
+
+SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+SIDECAR_VERSION = 1
+SIDECAR_EXTENSION = '.msgpack' if msgpack is not None else '.json'
+
+
+def load_yaml(stream: Any) -> Any:
+    """
+    Parse a YAML document with the fastest available safe loader.
+
+    Args:
+        stream (Any): YAML content as bytes, str or a file object.
+
+    Returns:
+        Any: The parsed document, identical to `yaml.safe_load`.
+    """
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def _encode(payload: Any) -> bytes:
+    if msgpack is not None:
+        return msgpack.packb(payload, use_bin_type=True)
+    return json.dumps(payload).encode('utf-8')
+
+
+def _decode(data: bytes) -> Any:
+    if msgpack is not None:
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+    return json.loads(data)
+
+
+def sidecar_path(path: str, sidecar_dir: str) -> str:
+    """Return the sidecar file of a YAML file."""
+    digest = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()
+    return os.path.join(sidecar_dir, f"{digest}{SIDECAR_EXTENSION}")
+
+
+def _signature(path: str) -> Tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _read_sidecar(path: str, signature: Tuple[int, int]) -> Tuple[bool, Any]:
+    """Return whether the sidecar matches the YAML file signature, and its content."""
+    try:
+        with open(path, 'rb') as f:
+            version, mtime_ns, size, content = _decode(f.read())
+    except FileNotFoundError:
+        return False, None
+    except Exception as e:  # pylint: disable=W0718
+        logger.warning('Ignoring unreadable config sidecar %s: %s', path, e)
+        return False, None
+    if version != SIDECAR_VERSION or (mtime_ns, size) != signature:
+        return False, None
+    return True, content
+
+
+def _write_sidecar(path: str, signature: Tuple[int, int], content: Any):
+    """Store a parsed file if its sidecar decodes back to the same objects."""
+    try:
+        data = _encode([SIDECAR_VERSION, *signature, content])
+        if _decode(data)[3] != content:
+            return
+    except (TypeError, ValueError, OverflowError):
+        # Dates, sets and other types the sidecar format cannot represent
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.sidecar-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def load_config_file(path: str, sidecar_dir: Optional[str] = None) -> Any:
+    """
+    Read and parse a YAML configuration file.
+
+    Args:
+        path (str): Path to the YAML file.
+        sidecar_dir (Optional[str]): Directory of the parsed files sidecars. Sidecars are not used
+            when None (default).
+
+    Returns:
+        Any: The parsed document, identical to `yaml.safe_load`.
+    """
+    if sidecar_dir is None:
+        with open(path, 'rb') as f:
+            return load_yaml(f)
+
+    signature = _signature(path)
+    cached_path = sidecar_path(path, sidecar_dir)
+    found, content = _read_sidecar(cached_path, signature)
+    if found:
+        return content
+
+    with open(path, 'rb') as f:
+        content = load_yaml(f)
+    _write_sidecar(cached_path, signature, content)
+    return content
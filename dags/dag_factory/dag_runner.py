@@ -4,15 +4,119 @@ It defines the `DataOpsDagGenerator` class, which scans a given directory for YA
 and creates DAGs based on the specified configuration, integrating with tools like dbt, dlt,
 and Facebook CAPI.
 """
+import hashlib
+import logging
+import multiprocessing
 import os
-from typing import Optional
-
-import yaml
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import partial
+from typing import Any, Dict, Mapping, Optional, Tuple
 
+from dag_factory.common import models
+from dag_factory.common.cache import get_cache
+from dag_factory.common.clients import building_dags
+from dag_factory.common.dag_index import DagIndex
+from dag_factory.common.decompose_plan import DecomposePlan
+from dag_factory.common.metrics import Metrics, build_exporter
 from dag_factory.common.models import Dag
+from dag_factory.common.snapshot import ConfigSnapshot
+from dag_factory.common.variables import MODEL_VARIABLES, VariableResolver, bind_variables, default_resolver
+from dag_factory.common.yaml_loader import load_config_file, load_yaml
+
+from dag_factory.common.config.config_tools import get_environment, render_many, render_sql_template
+from dag_factory.common.registry import LazyRegistry
+
+# DAG builders by tool, imported only when a configuration uses the tool
+DAG_BUILDERS = {
+    "dbt": "dag_factory.dbt_builder:generate_dbt_dags",
+    "dlt": "dag_factory.dlt_builder:generate_dlt_dag",
+}
+
+logger = logging.getLogger('airflow')
 
-from dag_factory.common.config.config_tools import render_sql_template
-from dag_factory.dag_builder import generate_dbt_dags, generate_dlt_dag
+# Modules whose code changes the validated configurations, part of the snapshot key
+VALIDATION_MODULES = ("models.py", "variables.py", "utils.py", "yaml_loader.py")
+
+
+def validation_fingerprint() -> str:
+    """Return a hash of the code of the modules used to parse and validate configurations."""
+    digest = hashlib.sha256()
+    common_path = os.path.dirname(models.__file__)
+    for module in VALIDATION_MODULES:
+        with open(os.path.join(common_path, module), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def compile_config_timed(content: bytes, variables: dict[str, Any]) -> Tuple[dict[str, Dag], dict]:
+    """
+    Parse the content of a YAML configuration file and validate every DAG defined in it, measuring
+    the parse of the file and the validation of each DAG.
+
+    Args:
+        content (bytes): Raw content of the configuration file.
+        variables (dict[str, Any]): Resolved Variables used by the validation.
+
+    Returns:
+        Tuple[dict[str, Dag], dict]: Validated DAG models keyed by DAG id, and the timings in
+            milliseconds: `{"parse": ms, "validate": {dag_id: ms}}`.
+    """
+    started_at = time.perf_counter()
+    yaml_data = load_yaml(content)
+    parse_ms = (time.perf_counter() - started_at) * 1000
+    validate_ms: Dict[str, float] = {}
+    dags = validate_config(yaml_data, variables, validate_ms)
+    return dags, {"parse": parse_ms, "validate": validate_ms}
+
+
+def validate_config(yaml_data: dict, variables: dict[str, Any],
+                    timings: Optional[Dict[str, float]] = None) -> dict[str, Dag]:
+    """
+    Validate every DAG defined in a parsed configuration file.
+
+    Args:
+        yaml_data (dict): Parsed content of the configuration file.
+        variables (dict[str, Any]): Resolved Variables used by the validation.
+        timings (Optional[Dict[str, float]]): If given, filled with the validation time of each DAG
+            in milliseconds.
+
+    Returns:
+        dict[str, Dag]: Validated DAG models keyed by DAG id.
+    """
+    dags = {}
+    with bind_variables(variables):
+        for item, dag in yaml_data["dags"].items():
+            started_at = time.perf_counter()
+            dag["dag_config"]["dag_id"] = item
+            dags[item] = Dag(**dag)
+            if timings is not None:
+                timings[item] = (time.perf_counter() - started_at) * 1000
+    return dags
+
+
+def load_dag(file_path: str, dag_id: str, variables: dict[str, Any], sidecar_dir: Optional[str] = None,
+             content: Optional[bytes] = None) -> Dag:
+    """
+    Read a YAML configuration file and validate a single DAG defined in it.
+
+    Args:
+        file_path (str): Path to the configuration file.
+        dag_id (str): Id of the DAG to validate.
+        variables (dict[str, Any]): Resolved Variables used by the validation.
+        sidecar_dir (Optional[str]): Directory of the parsed configs sidecars, if enabled.
+        content (Optional[bytes]): Content of the file if it was already read, parsed instead of
+            reading the file again.
+
+    Returns:
+        Dag: The validated DAG model.
+    """
+    document = load_yaml(content) if content is not None else load_config_file(file_path, sidecar_dir)
+    dag = document["dags"][dag_id]
+    dag["dag_config"]["dag_id"] = dag_id
+    with bind_variables(variables):
+        return Dag(**dag)
 
 
 class DagGenerator:
@@ -20,59 +124,190 @@ class DagGenerator:
         Class to process directories and generate Airflow DAGs based on YAML configuration files.
 
         Attributes:
-            dags_mapping (DataOpsMapping): Instance of DataOpsMapping to map DAG types to their generation functions.
+            dags_mapping (LazyRegistry): Registry mapping tools to their DAG generation functions.
+            snapshot (ConfigSnapshot): Compiled snapshot of the validated configurations.
+            parallelism (int): Number of workers used to parse and validate changed configuration files
+                concurrently. Files are processed sequentially if lower than 2.
+            executor (str): Kind of worker pool used when parallelism is enabled, "process" or "thread".
+                Daemonic processes (e.g. DAG processor children) are not allowed to have children,
+                whatever the start method, so the "process" executor compiles files sequentially
+                there: threads would not speed up the GIL-bound parsing and validation.
+            resolver (VariableResolver): Resolver of the Variables needed at parse time.
+            variables (dict[str, Any]): Variables used by the validation, resolved once per generator.
+            metrics (Metrics): Recorder of the parse-time metrics, exported at the end of every
+                `create_dags` call.
     """
-    def __init__(self, constants, on_failure):
-        DAGS = {
-            "dbt": generate_dbt_dags,
-            "dlt": generate_dlt_dag,
-        }
-        self.dags_mapping = DAGS
+    EXECUTORS = {
+        "process": ProcessPoolExecutor,
+        "thread": ThreadPoolExecutor,
+    }
+
+    def __init__(self, constants, on_failure, parallelism: int = 0, executor: str = "process",
+                 resolver: Optional[VariableResolver] = None, metrics: Optional[Metrics] = None):
+        if executor not in self.EXECUTORS:
+            raise ValueError(f"Unknown executor: {executor}")
+        self.metrics = metrics or Metrics(build_exporter(constants))
+        self.dags_mapping = LazyRegistry(DAG_BUILDERS)
         self.constants = constants
         self.on_failure = on_failure
+        self.parallelism = parallelism
+        self.executor = executor
+        self.resolver = resolver or default_resolver(
+            get_cache(constants.VARIABLE_CACHE_PATH), constants.VARIABLE_CACHE_EXPIRE_SEC
+        )
+        with self.metrics.timer("variables.resolve"):
+            self.variables = self.resolver.resolve(MODEL_VARIABLES)
+        self.snapshot = ConfigSnapshot(
+            constants.DAG_SNAPSHOT_PATH,
+            key=f"{constants.ENV}:{sorted(self.variables.items())}:{validation_fingerprint()}",
+            metrics=self.metrics,
+        )
 
-    def create_dags(self, directory, current_dag_id: str, dlt_tasks: Optional[dict]):
+    def create_dags(self, directory, current_dag_id: str, dlt_tasks: Optional[Mapping]):
         """
             Process a given directory to read YAML configuration files and generate Airflow DAGs.
 
+            Configurations are served from the compiled snapshot, so only files changed since the
+            previous parse are read and validated again, concurrently if parallelism is enabled
+            outside of daemonic processes.
+            When a single DAG is requested and the DAG index has a fresh entry for it, only its
+            configuration file is read. Timings, cache hit rates and error counts are recorded in
+            `metrics` and exported before returning.
+
             Args:
                 directory (str): The path to the directory containing the YAML configuration files.
                 current_dag_id (str): Id of the current dag from command line in worker
+                dlt_tasks (Optional[Mapping]): dlt source callables by DAG type and source name, usually
+                    `LazyRegistry` instances so that sources are only imported when used.
         """
 
-        kwargs = {
+        started_at = time.perf_counter()
+        try:
+            self._create_dags(directory, current_dag_id, self.builder_kwargs(dlt_tasks, directory))
+        finally:
+            self.metrics.timing("create_dags", (time.perf_counter() - started_at) * 1000,
+                                single_dag=current_dag_id is not None)
+            self._record_caches()
+            self.metrics.flush()
+
+    def _create_dags(self, directory, current_dag_id: Optional[str], kwargs: dict):
+        """Generate the DAGs of a directory, see `create_dags`."""
+        if current_dag_id is not None:
+            resolved = DagIndex(directory).resolve(current_dag_id)
+            self.metrics.incr("dag_index.hits" if resolved is not None else "dag_index.misses")
+            if resolved is not None:
+                file_path, content = resolved
+                with self.metrics.timer("config.load", file=file_path, dag_id=current_dag_id):
+                    dag = load_dag(
+                        file_path, current_dag_id, self.variables, self.constants.CONFIG_SIDECAR_PATH, content
+                    )
+                self._build_dag(dag, kwargs)
+                return
+
+        file_paths = []
+        for subdir in sorted(os.listdir(directory)):
+            subdir_path = os.path.join(directory, subdir)
+
+            if os.path.isdir(subdir_path):
+                for filename in sorted(os.listdir(subdir_path)):
+                    # Check if the file is a YAML file
+                    if filename.endswith('.yaml') or filename.endswith('.yml'):
+                        file_paths.append(os.path.join(subdir_path, filename))
+
+        hits, misses = self.snapshot.hits, self.snapshot.misses
+        scanned = False
+        try:
+            with self._pool() as pool:
+                compiled = self.snapshot.get_many(
+                    file_paths, partial(compile_config_timed, variables=self.variables),
+                    pool.map if pool else map, on_compiled=self._record_compiled,
+                )
+            scanned = True
+        except Exception:
+            self.metrics.incr("config.errors")
+            raise
+        finally:
+            self.snapshot.save(prune=scanned)
+
+        hits, misses = self.snapshot.hits - hits, self.snapshot.misses - misses
+        self.metrics.gauge("config.files", len(file_paths))
+        self.metrics.gauge("config.snapshot.hits", hits)
+        self.metrics.gauge("config.snapshot.misses", misses)
+        if file_paths:
+            self.metrics.gauge("config.snapshot.hit_rate", hits / len(file_paths))
+        logger.info("Compiled %d DAG config files, %d served from the snapshot", len(file_paths), hits)
+
+        # DAG objects are always built in this process, in file order
+        for dags in compiled:
+            for item, config in dags.items():
+                if current_dag_id is not None and current_dag_id != item:
+                    continue
+                self._build_dag(config, kwargs)
+
+    def builder_kwargs(self, dlt_tasks: Optional[Mapping], directory: str) -> dict:
+        """
+            Return the factory arguments passed to the DAG generation functions.
+
+            Args:
+                dlt_tasks (Optional[Mapping]): dlt source callables by DAG type and source name.
+                directory (str): The configuration directory, holding the decompose plan.
+        """
+        return {
             "DLT_TASKS": dlt_tasks,
             "AIRFLOW_ENV": self.constants.ENV,
             "render_sql_template": render_sql_template,
+            "render_many": render_many,
             "DBT_PROJECT_PATH": self.constants.DBT_PROJECT_PATH,
             "DBT_PROFILES_PATH": self.constants.DBT_PROFILES_PATH,
+            "DBT_DEPS_CACHE_PATH": self.constants.DBT_DEPS_CACHE_PATH,
             "DAGS_PATH": self.constants.DAGS_PATH,
             "TRANSFORM_PATH": self.constants.TRANSFORM_PATH,
+            "DECOMPOSE_PLAN": DecomposePlan(directory),
         }
 
-        for subdir in os.listdir(directory):
-            subdir_path = os.path.join(directory, subdir)
+    def _record_compiled(self, file_path: str, compiled: Tuple[dict[str, Dag], dict]) -> dict[str, Dag]:
+        """Record the timings of a compiled configuration file and return its DAGs, to be stored in the snapshot."""
+        dags, timings = compiled
+        self.metrics.timing("config.parse", timings["parse"], file=file_path)
+        for item, validate_ms in timings["validate"].items():
+            self.metrics.timing("config.validate", validate_ms, file=file_path, dag_id=item)
+        return dags
 
-            if os.path.isdir(subdir_path):
-                print(f"Reading YAML files in '{subdir}' directory:")
+    def _record_caches(self):
+        """Record the hit counts of the caches used while parsing."""
+        for name, value in get_cache(self.constants.VARIABLE_CACHE_PATH).metrics.items():
+            self.metrics.gauge(f"cache.variables.{name}", value)
+        environments = get_environment.cache_info()
+        self.metrics.gauge("cache.templates.hits", environments.hits)
+        self.metrics.gauge("cache.templates.misses", environments.misses)
 
-                for filename in os.listdir(subdir_path):
-                    file_path = os.path.join(subdir_path, filename)
+    def _pool(self):
+        """Return the worker pool used to compile configuration files, or an empty context if disabled."""
+        if self.parallelism < 2:
+            return nullcontext()
+        if self.executor == "process" and multiprocessing.current_process().daemon:
+            logger.debug("Compiling configuration files sequentially, daemonic processes cannot have children")
+            return nullcontext()
+        return self.EXECUTORS[self.executor](max_workers=self.parallelism)
 
-                    # Check if the file is a YAML file
-                    if filename.endswith('.yaml') or filename.endswith('.yml'):
-                        with open(file_path, 'r', encoding='utf-8') as file:
-                            yaml_data = yaml.safe_load(file)
-                            print(yaml_data["dags"].keys())
-                            for item in yaml_data["dags"].keys():
-                                if current_dag_id is not None and current_dag_id != item:
-                                    continue
-                                yaml_data["dags"][item]["dag_config"]["dag_id"] = item
-                                config = Dag(**yaml_data["dags"][item])
-                                try:
-                                    self.dags_mapping[config.tool](pipeline_config=config, **kwargs)
-                                except Exception as e:  # pylint: disable=W0718
-                                    print(f"Error in DAG '{item}': {str(e)}")
-                                    if self.on_failure == "IGNORE":
-                                        continue
-                                    raise e
+    def _build_dag(self, config: Dag, kwargs: dict):
+        """
+            Generate the Airflow DAG of a validated configuration, honouring the `on_failure` policy.
+
+            Args:
+                config (Dag): Validated DAG configuration.
+                kwargs (dict): Factory arguments passed to the generation function.
+        """
+        dag_id = config.dag_config.dag_id
+        started_at = time.perf_counter()
+        try:
+            with building_dags():
+                self.dags_mapping[config.tool](pipeline_config=config, **kwargs)
+        except Exception as e:  # pylint: disable=W0718
+            self.metrics.incr("dag.errors", dag_id=dag_id, tool=config.tool)
+            logger.error("Error in DAG '%s': %s", dag_id, e)
+            if self.on_failure == "IGNORE":
+                return
+            raise e
+        finally:
+            self.metrics.timing("dag.build", (time.perf_counter() - started_at) * 1000, dag_id=dag_id, tool=config.tool)
@@ -0,0 +1,71 @@
+"""Utilities for dbt DAGs generation."""
+
+from airflow.models import DAG
+from airflow.utils.trigger_rule import TriggerRule
+from cosmos import DbtTaskGroup, RenderConfig
+from cosmos.constants import TestBehavior
+
+from dag_factory.common.dbt_registry import get_dbt_project
+from dag_factory.common.models import Dag
+from dag_factory.common.tasks import end_task, start_task, waiters_group
+
+
+def generate_dbt_dags(pipeline_config: Dag, **kwargs) -> DAG:
+    """
+    Generates DBT (Data Build Tool) Airflow DAGs based on configurations loaded from YAML files.
+    This function reads configurations from YAML files, creates DAGs for each specified pipeline,
+    and orchestrates the execution of DBT tasks within the Airflow environment.
+    The Cosmos project and profile configurations are shared by all dbt DAGs of the process. The task
+    group is rendered from the manifest compiled at deploy time when it matches the deployed project,
+    and with automatic loading otherwise.
+    Args:
+    pipeline_config (Dag): The pipeline configuration object containing DAG and task configurations.
+
+    The function expects the following system arguments:
+    - ['tasks', 'run', <current_dag_id>]: To trigger the specific DBT DAG with the given ID.
+    """
+
+    airflow_env = kwargs.get("AIRFLOW_ENV")
+
+    dbt_project = get_dbt_project(
+        kwargs.get("DBT_PROJECT_PATH"),
+        kwargs.get("DBT_PROFILES_PATH"),
+        airflow_env,
+        kwargs.get("DBT_DEPS_CACHE_PATH"),
+    )
+
+    dbt_run_config = RenderConfig(
+        load_method=dbt_project.load_method,
+        select=[",".join(f"tag:{tag}" for tag in pipeline_config.dag_config.tags)],
+        test_behavior=TestBehavior.AFTER_EACH,
+    )
+
+    cosmos_config = {
+        "project_config": dbt_project.project_config,
+        "profile_config": dbt_project.profile_config,
+        "operator_args": dbt_project.operator_args,
+    }
+
+    with DAG(**pipeline_config.dag_config.dict()) as dag:
+        start = start_task()
+
+        outlet_name = (pipeline_config.dag_config.dag_id if pipeline_config.outlet else None)
+        trigger_rule = TriggerRule.ONE_SUCCESS if pipeline_config.detach_tests else TriggerRule.ALL_SUCCESS
+        end = end_task(outlet_name, trigger_rule)
+
+        dbt_run_tg = DbtTaskGroup(group_id="dbt_run_tg", render_config=dbt_run_config, **cosmos_config)
+
+        sensor_group = waiters_group(pipeline_config.depends_on, airflow_env)
+
+        cursor = start
+
+        if sensor_group:
+            cursor >> sensor_group
+            cursor = sensor_group
+
+        cursor >> dbt_run_tg
+        cursor = dbt_run_tg
+
+        cursor >> end
+
+    return dag
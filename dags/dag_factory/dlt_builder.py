@@ -0,0 +1,289 @@
+"""Utilities for dlt DAGs generation."""
+
+from functools import partial
+
+import dlt
+from airflow.datasets import Dataset
+from airflow.models import DAG
+from airflow.operators.python import PythonOperator
+from dlt.helpers.airflow_helper import PipelineTasksGroup
+
+from dag_factory.common.dlt_runtime import apply_env, dlt_env, extract_to_staging, load_from_staging, run_in_windows
+from dag_factory.common.dlt_stats import plan_runs, record_stats
+from dag_factory.common.models import Dag, Pipeline, PipelineTaskConfig, Task
+from dag_factory.common.runtime import runtime_settings
+from dag_factory.common.tasks import end_task, start_task, waiters_group
+from dag_factory.common.utils import name
+
+
+def _add_chunked_run(
+    pipeline: dlt.Pipeline,
+    task_id: str,
+    source_factory,
+    run_parameters: PipelineTaskConfig,
+    pipeline_kwargs: dict,
+    wipe_local_data: bool,
+    env: dict,
+    **operator_kwargs,
+) -> PythonOperator:
+    """
+    Adds a task running a dlt pipeline in chunked streaming mode to the current task group.
+
+    Args:
+        pipeline (dlt.Pipeline): The pipeline to run.
+        task_id (str): Id of the task.
+        source_factory (Callable): Function building a fresh source for every window.
+        run_parameters (PipelineTaskConfig): Configuration of the task, with `chunked` set.
+        pipeline_kwargs (dict): Other arguments of `dlt.pipeline`.
+        wipe_local_data (bool): Whether to remove the pipeline working folder after the run.
+        env (dict): dlt settings of the task, as environment variables. The chunked settings
+            take precedence.
+
+    Returns:
+        PythonOperator: The task running the pipeline.
+    """
+    chunked = run_parameters.chunked
+    return PythonOperator(
+        task_id=task_id,
+        python_callable=run_in_windows,
+        op_kwargs={
+            "pipeline_name": pipeline.pipeline_name,
+            "dataset_name": pipeline.dataset_name,
+            "pipeline_kwargs": pipeline_kwargs,
+            "source_factory": source_factory,
+            "max_windows": chunked.max_windows,
+            "env": {
+                **env,
+                **dlt_env(
+                    data_writer__buffer_max_items=chunked.buffer_max_items,
+                    data_writer__file_max_items=chunked.file_max_items,
+                    data_writer__file_max_bytes=chunked.file_max_bytes,
+                ),
+            },
+            "wipe_local_data": wipe_local_data,
+        },
+        do_xcom_push=False,
+        **run_parameters.operator_kwargs(),
+        **operator_kwargs,
+    )
+
+
+def _source_factory(dlt_tasks, dag_type: str, task: Task, **parameters):
+    """Return a function building the source of a task, raising if the source is unknown."""
+    if task.source not in dlt_tasks[dag_type]:
+        raise ValueError(f"Unknown task source: {task.source}")
+    return partial(dlt_tasks[dag_type][task.source], **parameters, **task.source_parameters or {})
+
+
+def _task_env(pipeline: Pipeline, task: Task) -> dict:
+    """Return the dlt settings of a task as environment variables: the load path and the runtime settings."""
+    return dlt_env(**{
+        **pipeline.common_config.dlt_settings(),
+        **runtime_settings(task.run_parameters, pipeline.runtime),
+    })
+
+
+def _fan_out_group(pipeline_config: Dag, dlt_tasks) -> PipelineTasksGroup:
+    """
+    Builds the task group of a fan-out pipeline.
+
+    Each source is extracted once into the staging area, then one task per transformer loads the
+    staged tables of its stream into the transformer dataset and updates its outlet.
+
+    Args:
+        pipeline_config (Dag): The pipeline configuration, with `fan_out` and transformers set.
+        dlt_tasks: dlt source callables by DAG type and source name.
+
+    Returns:
+        PipelineTasksGroup: The task group of the pipeline.
+    """
+    pipeline = pipeline_config.pipeline
+    pipeline_kwargs = pipeline.common_config.pipeline_kwargs()
+    wipe_local_data = pipeline.group_config.wipe_local_data
+    staging_dataset_name = name(pipeline.destination_name)
+
+    with PipelineTasksGroup(pipeline.pipeline_name, **pipeline.group_config.dict()) as pipeline_group:
+        prev_task = None
+        for task in pipeline.tasks:
+            source_factory = _source_factory(dlt_tasks, pipeline_config.dag_type, task)
+            f = source_factory()
+            if not f.resources:
+                continue
+
+            env = _task_env(pipeline, task)
+            operator_kwargs = task.run_parameters.operator_kwargs()
+            extract = PythonOperator(
+                task_id=f"{f.name}_extract",
+                python_callable=extract_to_staging,
+                op_kwargs={
+                    "pipeline_name": name(pipeline.pipeline_name),
+                    "dataset_name": staging_dataset_name,
+                    "pipeline_kwargs": pipeline_kwargs,
+                    "source_factory": source_factory,
+                    "bucket_url": pipeline.fan_out.bucket_url,
+                    "streams": [transformer["name"] for transformer in pipeline_config.transformers.values()],
+                    "wipe_local_data": wipe_local_data,
+                    "env": env,
+                },
+                **operator_kwargs,
+            )
+            if prev_task is not None:
+                prev_task >> extract
+            prev_task = extract
+
+            for resource, transformer in pipeline_config.transformers.items():
+                extract >> PythonOperator(
+                    task_id=f"{f.name}_{resource}_load",
+                    python_callable=load_from_staging,
+                    op_kwargs={
+                        "pipeline_name": name(pipeline.pipeline_name + resource),
+                        "dataset_name": name(pipeline.destination_name + resource),
+                        "pipeline_kwargs": pipeline_kwargs,
+                        "bucket_url": pipeline.fan_out.bucket_url,
+                        "staging_dataset_name": staging_dataset_name,
+                        "extract_task_id": extract.task_id,
+                        "stream_name": transformer["name"],
+                        "wipe_local_data": wipe_local_data,
+                        "env": env,
+                    },
+                    outlets=[Dataset(f"gcs://dataset-bucket/{resource}")] if transformer.get("outlet") else None,
+                    do_xcom_push=False,
+                    **operator_kwargs,
+                )
+
+    return pipeline_group
+
+
+def generate_dlt_dag(pipeline_config: Dag, **kwargs) -> DAG:
+    """
+    General function to generate an Airflow DLT DAG based on the given configuration.
+
+    Each transformer gets its own pipeline extracting the sources, unless `fan_out` is set: sources
+    are then extracted once into a staging area shared by the transformers.
+
+    Args:
+        pipeline_config (Dag): The pipeline configuration object containing DAG and task configurations.
+
+    Returns:
+        DAG: The generated Airflow DAG.
+    """
+    airflow_env = kwargs.get("AIRFLOW_ENV")
+    with DAG(**pipeline_config.dag_config.dict()) as dag:
+        start = start_task()
+
+        outlet_name = (
+            pipeline_config.dag_config.dag_id if pipeline_config.outlet else None
+        )
+        end = end_task(outlet_name)
+
+        sensor_group = waiters_group(pipeline_config.depends_on, airflow_env)
+
+        if pipeline_config.pipeline.fan_out and pipeline_config.transformers:
+            pipeline_group = _fan_out_group(pipeline_config, kwargs.get("DLT_TASKS"))
+            if sensor_group:
+                start >> sensor_group >> pipeline_group
+            else:
+                start >> pipeline_group
+            pipeline_group >> end
+            return dag
+
+        common_config = pipeline_config.pipeline.common_config
+
+        for resource in pipeline_config.transformers or [None]:
+            resource_name = (
+                pipeline_config.transformers[resource].get("name") if resource else None
+            )
+            write_outlet = (
+                pipeline_config.transformers[resource].get("outlet")
+                if resource
+                else False
+            )
+            with PipelineTasksGroup(
+                resource or pipeline_config.pipeline.pipeline_name,
+                **pipeline_config.pipeline.group_config.dict(),
+            ) as pipeline_group:
+
+                pipeline = dlt.pipeline(
+                    pipeline_name=name(
+                        pipeline_config.pipeline.pipeline_name + (resource or "")
+                    ),
+                    dataset_name=name(
+                        pipeline_config.pipeline.destination_name + (resource or "")
+                    ),
+                    **common_config.pipeline_kwargs(),
+                )
+
+                prev_task = start
+                for task in pipeline_config.pipeline.tasks:
+                    stream_name = (
+                        {"stream_name": resource_name}
+                        if resource_name is not None
+                        else {}
+                    )
+
+                    source_factory = _source_factory(
+                        kwargs.get("DLT_TASKS"), pipeline_config.dag_type, task, **stream_name
+                    )
+                    f = source_factory()
+
+                    env = _task_env(pipeline_config.pipeline, task)
+                    additional_args = {"outlets": None}
+                    if env and not task.run_parameters.chunked:
+                        additional_args["pre_execute"] = partial(apply_env, env=env)
+
+                    if write_outlet:
+                        additional_args["outlets"] = [
+                            Dataset(f"gcs://dataset-bucket/{resource}")
+                        ]
+
+                    if not f.resources:
+                        continue
+                    if task.run_parameters.chunked:
+                        tasks = [
+                            _add_chunked_run(
+                                pipeline,
+                                f.name,
+                                source_factory,
+                                task.run_parameters,
+                                common_config.pipeline_kwargs(),
+                                pipeline_config.pipeline.group_config.wipe_local_data,
+                                env,
+                                **additional_args,
+                            )
+                        ]
+                    elif task.run_parameters.decompose == "auto":
+                        resources = list(f.selected_resources.keys())
+                        plan = kwargs.get("DECOMPOSE_PLAN")
+                        stats = plan.stats(pipeline.pipeline_name) if plan is not None else {}
+                        tasks = []
+                        for resource_names, decompose in plan_runs(
+                            resources, stats, task.run_parameters.auto_decompose
+                        ):
+                            tasks.extend(
+                                pipeline_group.add_run(
+                                    pipeline,
+                                    f.with_resources(*resource_names),
+                                    **{**task.run_parameters.add_run_kwargs(), "decompose": decompose},
+                                    **additional_args,
+                                    post_execute=partial(record_stats, pipeline_name=pipeline.pipeline_name),
+                                )
+                            )
+                    else:
+                        tasks = pipeline_group.add_run(
+                            pipeline,
+                            f,
+                            **task.run_parameters.add_run_kwargs(),
+                            **additional_args,
+                        )
+                    for t in tasks:
+                        prev_task >> t
+                        prev_task = t
+
+            if sensor_group:
+                start >> sensor_group >> pipeline_group
+            else:
+                start >> pipeline_group
+
+            pipeline_group >> end
+
+    return dag
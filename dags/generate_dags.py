@@ -6,9 +6,8 @@ import sys
 from dag_factory.dag_runner import DagGenerator
 from airflow import DAG
 
-from ingest.pull.ga4_pipeline.ga4_pipeline import ga4_source
-
 from dag_factory.common import constants
+from dag_factory.common.registry import LazyRegistry
 
 DAGS_FOLDER = os.path.abspath(os.path.dirname(__file__))
 if DAGS_FOLDER not in sys.path:
@@ -18,11 +17,17 @@ os.environ["ENV"] = constants.ENV
 os.environ["DAG_OWNERS"] = json.dumps(constants.DAG_OWNERS)
 os.environ["DAG_CONFIG_PATH"] = constants.DAG_CONFIG_PATH
 
+# Sources are imported only when a config references them
 DLT_TASKS = {
-    "ga4": {"ga4_source": ga4_source},
+    "ga4": LazyRegistry({"ga4_source": "ingest.pull.ga4_pipeline.ga4_pipeline:ga4_source"}),
 }
 
-dag_runner = DagGenerator(constants=constants, on_failure="NOT_IGNORE")
+dag_runner = DagGenerator(
+    constants=constants,
+    on_failure="NOT_IGNORE",
+    parallelism=constants.DAG_FACTORY_PARALLELISM,
+    executor=constants.DAG_FACTORY_EXECUTOR,
+)
 
 current_dag_id = None
 if len(sys.argv) > 3 and sys.argv[1:3] == ['tasks', 'run']:
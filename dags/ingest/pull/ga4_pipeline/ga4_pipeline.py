@@ -1,5 +1,12 @@
 """Loads data from GA4 sample"""
 import logging
+import queue
+import re
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Iterator, List, Optional
 
 import dlt
 from dlt.common import pendulum
@@ -8,52 +15,208 @@ from dlt.destinations.adapters import bigquery_adapter
 
 from google.cloud import bigquery
 
+from dag_factory.common.clients import get_client
+
 
 GA4_TABLE = "bigquery-public-data.ga4_obfuscated_sample_ecommerce.events_*"
 
+COLUMN_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# Result pages buffered per day extracted ahead of the day being loaded
+PAGES_BUFFERED_PER_DAY = 2
+
+_END_OF_DAY = object()
+
 logger = logging.getLogger(__name__)
 
+
+def _bqstorage_client():
+    """Return a BigQuery Storage Read API client, or None if the library is not installed."""
+    try:
+        from google.cloud import bigquery_storage  # pylint: disable=C0415
+    except ImportError:
+        logger.warning("google-cloud-bigquery-storage is not installed, reading Arrow pages over REST")
+        return None
+    return get_client(bigquery_storage.BigQueryReadClient)
+
+
+def _put(pages: queue.Queue, item: Any, stop: threading.Event) -> bool:
+    """Put an item into a day's page queue, waiting for room unless the backfill is stopped."""
+    while not stop.is_set():
+        try:
+            pages.put(item, timeout=1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _fill(pages: queue.Queue, day_pages: Iterator[Any], stop: threading.Event):
+    """Move the pages of a day into its queue, ending with `_END_OF_DAY` or the raised exception."""
+    try:
+        for page in day_pages:
+            if not _put(pages, page, stop):
+                return
+        end = _END_OF_DAY
+    except Exception as e:  # pylint: disable=W0718
+        end = e
+    _put(pages, end, stop)
+
+
 @dlt.source
-def ga4_source(initial_load_start: str = "2020-11-01"):
+def ga4_source(
+    initial_load_start: str = "2020-11-01",
+    columnar: bool = False,
+    backfill_days: int = 1,
+    max_parallelism: int = 1,
+    end_date: Optional[str] = None,
+    timezone: str = "UTC",
+    columns: Optional[List[str]] = None,
+    max_bytes_scanned: Optional[int] = None,
+):
     """
     GA4 sample‑ecommerce loader that writes daily Parquet files to GCS.
 
-    Each pipeline run processes **exactly one** day of data from
-    `bigquery-public-data.ga4_obfuscated_sample_ecommerce.events_*`
-    and advances the bookmark stored in `dlt.current.state()["ga4_date"]`.
+    Each pipeline run processes up to `backfill_days` days (**exactly one** by default) of data from
+    `bigquery-public-data.ga4_obfuscated_sample_ecommerce.events_*`, starting at the bookmark stored in
+    `dlt.current.state()["ga4_date"]`, and never goes past `end_date` (default: None) nor past
+    yesterday in the `timezone` of the GA4 property (default: UTC), the last day whose export can be
+    complete.
+
+    Days are yielded page by page in date order, and the bookmark advances past each day once all its
+    pages are yielded. A day without rows, whose table is not exported yet or is empty, stops the
+    run without advancing the bookmark, so the next run retries it. With `max_parallelism` above 1, several days are extracted concurrently, each
+    buffering at most `PAGES_BUFFERED_PER_DAY` pages ahead of the day being yielded. If the query of a
+    day fails after earlier days completed, the run stops there and keeps them, and the next run
+    resumes from the failed day. A failure on the first day, or once a day's pages started to be
+    yielded, fails the run.
+
+    `columns` projects the query on the listed top-level GA4 columns instead of `SELECT *`. Every
+    query is dry-run first: the estimated bytes scanned are logged and checked against
+    `max_bytes_scanned`, which is also enforced as the job's maximum bytes billed.
+
+    With `columnar` enabled, result pages are read as Arrow record batches through the
+    BigQuery Storage Read API and handed to dlt as is, instead of one dict per row. Arrow
+    data is not normalized by dlt: repeated fields such as `event_params` and `items` stay
+    nested columns instead of being unpacked into child tables.
+
+    The source is built while DAGs are parsed: BigQuery clients are only created, once per process,
+    when the events are extracted.
     """
 
-    bq_client = bigquery.Client()
-    @dlt.resource(
-        write_disposition="append",
-    )
-    def ga4_events():
-
-        run_date = ensure_pendulum_datetime(
-            dlt.current.state().setdefault(
-                "ga4_date", pendulum.parse(initial_load_start)
-            )
-        ).date()
+    for column in columns or []:
+        if not COLUMN_NAME.match(column):
+            raise ValueError(f"Invalid GA4 column name: {column}")
+    projection = ", ".join(f"`{column}`" for column in columns) if columns else "*"
 
+    def extract_day(run_date):
         logger.info("GA4 run_date: %s", run_date)
+        bq_client = get_client(bigquery.Client)
 
         query = f"""
-            SELECT *
+            SELECT {projection}
             FROM `{GA4_TABLE}`
             WHERE _TABLE_SUFFIX = FORMAT_DATE('%Y%m%d', @run_date)
         """
+        query_parameters = [
+            bigquery.ScalarQueryParameter("run_date", "DATE", run_date)
+        ]
+
+        dry_run = bq_client.query(
+            query,
+            job_config=bigquery.QueryJobConfig(
+                query_parameters=query_parameters, dry_run=True, use_query_cache=False
+            ),
+        )
+        logger.info("GA4 %s query will scan %s bytes", run_date, dry_run.total_bytes_processed)
+        if max_bytes_scanned is not None and dry_run.total_bytes_processed > max_bytes_scanned:
+            raise ValueError(
+                f"GA4 query for {run_date} would scan {dry_run.total_bytes_processed} bytes, "
+                f"above the {max_bytes_scanned} bytes ceiling"
+            )
 
         job_config = bigquery.QueryJobConfig(
-            query_parameters=[
-                bigquery.ScalarQueryParameter("run_date", "DATE", run_date)
-            ]
+            query_parameters=query_parameters,
+            maximum_bytes_billed=max_bytes_scanned,
         )
 
-        for row in bq_client.query(query, job_config=job_config).result():
-            yield dict(row)
+        result = bq_client.query(query, job_config=job_config).result()
+        if not result.total_rows:
+            return
+        if columnar:
+            yield from result.to_arrow_iterable(bqstorage_client=_bqstorage_client())
+        else:
+            for page in result.pages:
+                yield [dict(row) for row in page]
 
-        next_date = pendulum.date(run_date.year, run_date.month, run_date.day).add(days=1)
-        dlt.current.state()["ga4_date"] = next_date.isoformat()
+    @dlt.resource(
+        write_disposition="append",
+    )
+    def ga4_events():
+        state = dlt.current.state()
+        bookmark = ensure_pendulum_datetime(
+            state.setdefault("ga4_date", pendulum.parse(initial_load_start))
+        )
+        start_date = pendulum.date(bookmark.year, bookmark.month, bookmark.day)
+        last_date = pendulum.now(timezone).date().subtract(days=1)
+        if end_date:
+            last_date = min(last_date, pendulum.parse(end_date).date())
+        days = [start_date.add(days=offset) for offset in range(backfill_days)]
+        days = [day for day in days if day <= last_date]
+
+        if max_parallelism <= 1:
+            for run_date in days:
+                day_pages = extract_day(run_date)
+                try:
+                    # The query of the day runs on the first page
+                    first_page = next(day_pages, None)
+                except Exception:  # pylint: disable=W0718
+                    if run_date == start_date:
+                        raise
+                    logger.exception("GA4 extraction of %s failed, stopping the backfill", run_date)
+                    return
+                if first_page is None:
+                    logger.warning("GA4 table of %s is missing or empty, stopping the backfill", run_date)
+                    return
+                yield first_page
+                yield from day_pages
+                state["ga4_date"] = run_date.add(days=1).isoformat()
+            return
+
+        # At most `max_parallelism` days are extracted at any time, each buffering a few pages
+        stop = threading.Event()
+        with ThreadPoolExecutor(max_workers=max_parallelism) as executor:
+
+            def submit(run_date):
+                pages = queue.Queue(maxsize=PAGES_BUFFERED_PER_DAY)
+                executor.submit(_fill, pages, extract_day(run_date), stop)
+                return run_date, pages
+
+            remaining = iter(days)
+            pending = deque(submit(run_date) for run_date in islice(remaining, max_parallelism))
+            try:
+                while pending:
+                    run_date, pages = pending.popleft()
+                    started = False
+                    while (page := pages.get()) is not _END_OF_DAY:
+                        if isinstance(page, Exception):
+                            if started or run_date == start_date:
+                                raise page
+                            logger.error("GA4 extraction of %s failed, stopping the backfill: %s", run_date, page)
+                            return
+                        started = True
+                        yield page
+                    if not started:
+                        logger.warning("GA4 table of %s is missing or empty, stopping the backfill", run_date)
+                        return
+
+                    next_date = next(remaining, None)
+                    if next_date is not None:
+                        pending.append(submit(next_date))
+                    state["ga4_date"] = run_date.add(days=1).isoformat()
+            finally:
+                # Unblocks the extractions still running, also when the resource is closed early
+                stop.set()
 
     bigquery_adapter(
         ga4_events,
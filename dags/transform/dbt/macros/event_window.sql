@@ -0,0 +1,78 @@
+{#
+    Processed window of the incremental models.
+
+    Incremental runs only rebuild the partitions of the event dates loaded by dlt since the model
+    was last built: the GA4 rows of the loads recorded in `_dlt_loads` after the last modification
+    of the model's table, whatever the DAG run's data interval. The window is widened by
+    `window_lookback_days` to pick up late events. The `window_start` and `window_end` vars (dates,
+    end excluded) override it, e.g. to rebuild a range by hand. With nothing loaded since the last
+    build no partition is rebuilt; without a previous build, or on a full refresh, every partition
+    is rebuilt, and the window is none.
+
+    The window costs queries, so a model computes it once at the top and passes it to every
+    `event_window_filter`:
+
+        {%- set window = event_window() -%}
+        ... where {{ event_window_filter('event_date', window) }}
+
+    The recent load ids are read from `_dlt_loads` first, so the events are only scanned for the
+    rows of those loads, and not at all when nothing was loaded.
+#}
+
+{% macro event_window() -%}
+    {%- if not (is_incremental() and execute) -%}
+        {{ return(none) }}
+    {%- endif -%}
+    {%- if var('window_start', none) and var('window_end', none) -%}
+        {{ return({'start': var('window_start'), 'end': var('window_end')}) }}
+    {%- endif -%}
+    {%- set events = source('ga4_full_sample', 'ga4_events') -%}
+    {%- set loads = api.Relation.create(database=events.database, schema=events.schema, identifier='_dlt_loads') -%}
+    {%- set loads_query -%}
+        select string_agg(format("'%s'", load_id), ', ')
+        from {{ loads }}
+        where status = 0
+            and inserted_at > (
+                select timestamp_millis(last_modified_time)
+                from `{{ this.database }}.{{ this.schema }}.__TABLES__`
+                where table_id = '{{ this.identifier }}'
+            )
+    {%- endset -%}
+    {%- set load_ids = run_query(loads_query).rows[0][0] -%}
+    {%- if not load_ids -%}
+        {{ return({'start': none, 'end': none}) }}
+    {%- endif -%}
+    {%- set query -%}
+        select
+            cast(min({{ event_date('event_date') }}) as string),
+            cast(date_add(max({{ event_date('event_date') }}), interval 1 day) as string)
+        from {{ events }}
+        where _dlt_load_id in ({{ load_ids }})
+    {%- endset -%}
+    {%- set row = run_query(query).rows[0] -%}
+    {{ return({'start': row[0], 'end': row[1]}) }}
+{%- endmacro %}
+
+
+{#
+    Filter of the rows of a window returned by `event_window`, all rows without a window.
+
+    `margin_days` widens the filter on both sides, for models whose partitions are not event dates
+    (e.g. UTC days of event timestamps), which must then keep only the rows of the window with
+    `event_window_filter(<partition column>, window)` to rebuild complete partitions.
+#}
+{% macro event_window_filter(column, window, margin_days=0) -%}
+    {%- if window is none -%}
+        true
+    {%- elif window['start'] and window['end'] -%}
+        {{ column }} >= date_sub(date '{{ window["start"] }}', interval {{ var('window_lookback_days', 0) + margin_days }} day)
+        and {{ column }} < date_add(date '{{ window["end"] }}', interval {{ margin_days }} day)
+    {%- else -%}
+        false
+    {%- endif -%}
+{%- endmacro %}
+
+
+{% macro event_date(column) -%}
+    parse_date('%Y%m%d', {{ column }})
+{%- endmacro %}
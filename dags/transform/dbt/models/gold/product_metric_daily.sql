@@ -1,3 +1,8 @@
+{{ config(
+    partition_by={'field': 'as_of_day', 'data_type': 'timestamp', 'granularity': 'day'}
+) }}
+
+{%- set window = event_window() -%}
 
 with user_item_view_funnel as (
     select
@@ -11,6 +16,8 @@ with user_item_view_funnel as (
         countif(purchase_completed = 1) as purchase,
         sum(if(purchase_completed = 1, purchase_revenue_usd, 0)) as purchase_revenue_usd
     from {{ ref('user_item_funnel') }}
+    where {{ event_window_filter('event_date', window, margin_days=1) }}
+        and {{ event_window_filter('date(cast(view_item_started_at as timestamp))', window) }}
     group by 1,2,3,4,5
 
 )
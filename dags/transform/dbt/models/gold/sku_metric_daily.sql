@@ -1,3 +1,9 @@
+{{ config(
+    partition_by={'field': 'as_of_day', 'data_type': 'timestamp', 'granularity': 'day'}
+) }}
+
+{%- set window = event_window() -%}
+
 select
     date_trunc(cast(purchase_completed_at as timestamp), day) as as_of_day,
     sku_product_id,
@@ -16,4 +22,6 @@ select
 
 from {{ ref('user_item_funnel') }}
 where purchase_completed = 1
+    and {{ event_window_filter('event_date', window, margin_days=1) }}
+    and {{ event_window_filter('date(cast(purchase_completed_at as timestamp))', window) }}
 group by 1,2,3,4,5,6,7
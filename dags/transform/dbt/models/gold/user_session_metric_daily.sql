@@ -1,3 +1,8 @@
+{{ config(
+    partition_by={'field': 'as_of_day', 'data_type': 'timestamp', 'granularity': 'day'}
+) }}
+
+{%- set window = event_window() -%}
 
 with user_session as (
     select
@@ -30,6 +35,8 @@ with user_session as (
         sum(total_item_quantity) as total_item_quantity
 
     from {{ ref('user_purchase_transaction_session') }}
+    where {{ event_window_filter('event_date', window, margin_days=1) }}
+        and {{ event_window_filter('date(cast(session_started_at as timestamp))', window) }}
     group by 1, 2
 
 )
@@ -1,3 +1,8 @@
+{{ config(
+    partition_by={'field': 'event_date', 'data_type': 'date'}
+) }}
+
+{%- set window = event_window() -%}
 
 with promo_summary as (
     select
@@ -8,11 +13,13 @@ with promo_summary as (
         sum(select_promo_completed) as select_promo_unique,
         sum(select_promo_count) as select_promo_total
     from {{ ref('user_session_promotion') }}
+    where {{ event_window_filter('event_date', window) }}
     group by 1, 2
 )
 
 
 select
+    ss.event_date,
     ss.session_started_at,
     ss.profile_id,
     ss.session_id,
@@ -80,3 +87,4 @@ left join {{ ref('user_checkout_screen') }} cs
     on
         ss.profile_id = cs.profile_id
         and ss.session_id = cs.session_id
+where {{ event_window_filter('ss.event_date', window) }}
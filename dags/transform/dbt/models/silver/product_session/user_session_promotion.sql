@@ -1,4 +1,11 @@
+{{ config(
+    partition_by={'field': 'event_date', 'data_type': 'date'}
+) }}
+
+{%- set window = event_window() -%}
+
 select
+    ss.event_date,
     vp.view_promo_started_at,
     ss.profile_id,
     ss.session_id,
@@ -50,4 +57,5 @@ left join {{ ref('user_select_promotion') }} sp
     on
         vp.profile_id = sp.profile_id
         and vp.session_id = sp.session_id
-        and vp.promo_name = sp.promo_name
\ No newline at end of file
+        and vp.promo_name = sp.promo_name
+where {{ event_window_filter('ss.event_date', window) }}
\ No newline at end of file
@@ -1,6 +1,13 @@
+{{ config(
+    partition_by={'field': 'event_date', 'data_type': 'date'}
+) }}
+
+{%- set window = event_window() -%}
+
 with add_card_base_fields as (
     select * from {{ source('ga4_full_sample', 'ga4_events') }}
     where event_name = 'add_to_cart'
+        and {{ event_window_filter(event_date('event_date'), window) }}
 ),
 
 add_product_item_card as (
@@ -19,6 +26,7 @@ add_product_item_card as (
 )
 
 select
+    event_date,
     add_card_at,
     profile_id,
     session_id,
@@ -37,6 +45,7 @@ from (
         format_timestamp(
                 '%Y-%m-%d %H:%M:%S', timestamp_trunc(timestamp_micros(ac.event_timestamp), second)
         ) as add_card_at,
+        {{ event_date('ac.event_date') }} as event_date,
         ac.user_pseudo_id as profile_id,
         format_timestamp(
                 '%Y-%m-%d %H:%M:%S', timestamp_trunc(timestamp_micros(ac.user_first_touch_timestamp), second)
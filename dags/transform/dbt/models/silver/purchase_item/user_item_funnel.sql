@@ -1,5 +1,11 @@
+{{ config(
+    partition_by={'field': 'event_date', 'data_type': 'date'}
+) }}
+
+{%- set window = event_window() -%}
 
 select
+    vi.event_date,
     vi.view_item_started_at,
     vi.profile_id,
     vi.session_id,
@@ -64,4 +70,5 @@ left join {{ ref('item_add_card') }} ac
 left join {{ ref('user_purchase_item') }} pi
     on vi.profile_id = pi.profile_id
     and vi.session_id = pi.session_id
-    and vi.product_name = pi.product_name
\ No newline at end of file
+    and vi.product_name = pi.product_name
+where {{ event_window_filter('vi.event_date', window) }}
\ No newline at end of file
@@ -1,3 +1,8 @@
+{{ config(
+    partition_by={'field': 'event_date', 'data_type': 'date'}
+) }}
+
+{%- set window = event_window() -%}
 
 with product_items as (
     select
@@ -17,6 +22,7 @@ with product_items as (
 
 select * from (
     select
+        tc.event_date,
         tc.purchase_completed_at,
         tc.profile_id,
         tc.session_id,
@@ -61,5 +67,6 @@ select * from (
     from {{ ref('user_transaction_completed') }} tc
     left join product_items ei
         on tc.event_row_id = ei.product_row_id
+    where {{ event_window_filter('tc.event_date', window) }}
 )
 where dedup_row = 1
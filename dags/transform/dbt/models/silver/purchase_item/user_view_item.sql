@@ -1,7 +1,13 @@
+{{ config(
+    partition_by={'field': 'event_date', 'data_type': 'date'}
+) }}
+
+{%- set window = event_window() -%}
 
 with view_item_base_fields as (
     select * from {{ source('ga4_full_sample', 'ga4_events') }}
     where event_name = 'view_item'
+        and {{ event_window_filter(event_date('event_date'), window) }}
 ),
 
 view_product_item as (
@@ -19,6 +25,7 @@ view_product_item as (
 )
 
 select
+    event_date,
     view_item_started_at,
     profile_id,
     session_id,
@@ -44,6 +51,7 @@ select
     format_timestamp(
             '%Y-%m-%d %H:%M:%S', timestamp_trunc(timestamp_micros(bf.event_timestamp), second)
     ) as view_item_started_at,
+    {{ event_date('bf.event_date') }} as event_date,
     bf.user_pseudo_id as profile_id,
     format_timestamp(
             '%Y-%m-%d %H:%M:%S', timestamp_trunc(timestamp_micros(bf.user_first_touch_timestamp), second)
@@ -1,10 +1,17 @@
+{{ config(
+    partition_by={'field': 'event_date', 'data_type': 'date'}
+) }}
+
+{%- set window = event_window() -%}
 
 with checkout_base_fields as (
     select * from {{ source('ga4_full_sample', 'ga4_events') }}
     where event_name = 'begin_checkout'
+        and {{ event_window_filter(event_date('event_date'), window) }}
 )
 
 select
+    event_date,
     checkout_started_at,
     profile_id,
     session_id,
@@ -24,6 +31,7 @@ from (
         format_timestamp(
                 '%Y-%m-%d %H:%M:%S', timestamp_trunc(timestamp_micros(bf.event_timestamp), second)
         ) as checkout_started_at,
+        {{ event_date('bf.event_date') }} as event_date,
         bf.user_pseudo_id as profile_id,
         format_timestamp(
                 '%Y-%m-%d %H:%M:%S', timestamp_trunc(timestamp_micros(bf.user_first_touch_timestamp), second)
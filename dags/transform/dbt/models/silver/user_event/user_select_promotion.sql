@@ -1,7 +1,13 @@
+{{ config(
+    partition_by={'field': 'event_date', 'data_type': 'date'}
+) }}
+
+{%- set window = event_window() -%}
 
 with promotion_base_fields as (
     select * from {{ source('ga4_full_sample', 'ga4_events') }}
     where event_name = 'select_promotion'
+        and {{ event_window_filter(event_date('event_date'), window) }}
 ),
 
 promotion_items as (
@@ -14,6 +20,7 @@ promotion_items as (
 )
 
 select
+    event_date,
     select_promo_started_at,
     profile_id,
     session_id,
@@ -41,6 +48,7 @@ from (
         format_timestamp(
                 '%Y-%m-%d %H:%M:%S', timestamp_trunc(timestamp_micros(bf.event_timestamp), second)
         ) AS select_promo_started_at,
+        {{ event_date('bf.event_date') }} as event_date,
         bf.user_pseudo_id as profile_id,
         format_timestamp(
                 '%Y-%m-%d %H:%M:%S', timestamp_trunc(timestamp_micros(bf.user_first_touch_timestamp), second)
@@ -1,6 +1,13 @@
+{{ config(
+    partition_by={'field': 'event_date', 'data_type': 'date'}
+) }}
+
+{%- set window = event_window() -%}
+
 with purchase_base_fields as (
     select * from {{ source('ga4_full_sample', 'ga4_events') }}
     where event_name = 'purchase'
+        and {{ event_window_filter(event_date('event_date'), window) }}
 ),
 
 purchase_event_value AS (
@@ -17,6 +24,7 @@ purchase_event_value AS (
 )
 
 select
+    event_date,
     event_row_id,
     purchase_completed_at,
     profile_id,
@@ -59,6 +67,7 @@ from (
         format_timestamp(
                 '%Y-%m-%d %H:%M:%S', timestamp_trunc(timestamp_micros(bf.event_timestamp), second)
         ) as purchase_completed_at,
+        {{ event_date('bf.event_date') }} as event_date,
         bf.user_pseudo_id as profile_id,
         format_timestamp(
                 '%Y-%m-%d %H:%M:%S', timestamp_trunc(timestamp_micros(bf.user_first_touch_timestamp), second)
@@ -14,10 +14,16 @@ module "simple-composer-environment" {
 
   resilience_mode = "STANDARD_RESILIENCE"
   pypi_packages = {
-    "dlt" = "==1.11.0"
+    # gs extra: gcsfs, used by the filesystem staging destination on GCS
+    "dlt" = "[gs]==1.11.0"
+    "google-cloud-bigquery-storage" = "==2.31.0"
     "dbt-bigquery" = "==1.9.2"
     "astronomer-cosmos" = "==1.10.1"
   }
+  env_variables = {
+    # Staging bucket of the dlt pipelines loading through load jobs
+    DESTINATION__FILESYSTEM__BUCKET_URL = "${google_storage_bucket.composer_bucket.url}/dlt-staging"
+  }
   depends_on = [
     google_project_iam_member.editor_sa,
   ]
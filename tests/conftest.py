@@ -0,0 +1,5 @@
+"""Puts the DAGs folder on the import path, as Airflow does when parsing DAGs."""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'dags'))
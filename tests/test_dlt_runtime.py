@@ -0,0 +1,42 @@
+import dlt
+
+from dag_factory.common.dlt_runtime import run_in_windows
+
+
+def run(tmp_path, rows_per_window, max_windows=10):
+    """Run a source whose resource advances its state every window and yields the next configured rows."""
+    windows = []
+
+    @dlt.source
+    def source():
+        @dlt.resource
+        def events():
+            state = dlt.current.resource_state()
+            window = state.get("window", 0)
+            state["window"] = window + 1
+            windows.append(window)
+            if window < len(rows_per_window):
+                yield from rows_per_window[window]
+
+        return events
+
+    pipeline_kwargs = {
+        "destination": dlt.destinations.filesystem(str(tmp_path / "bucket")),
+        "pipelines_dir": str(tmp_path / "pipelines"),
+    }
+    load_info = run_in_windows("windows", "windows", pipeline_kwargs, source, max_windows, {})
+    return load_info, windows
+
+
+def test_stops_when_a_window_only_updates_state(tmp_path):
+    load_info, windows = run(tmp_path, [])
+
+    assert load_info is None
+    assert windows == [0]
+
+
+def test_stops_after_the_last_window_with_data(tmp_path):
+    load_info, windows = run(tmp_path, [[{"id": 1}, {"id": 2}], [{"id": 3}]])
+
+    assert load_info is not None
+    assert windows == [0, 1, 2]
@@ -0,0 +1,51 @@
+import pytest
+
+from dag_factory.common.runtime import (
+    BUFFER_BYTES_PER_ITEM,
+    BUFFER_MEMORY_SHARE,
+    DLT_DEFAULT_BUFFER_MAX_ITEMS,
+    parse_cpu,
+    parse_memory,
+    sized_settings,
+)
+
+
+@pytest.mark.parametrize("quantity, cores", [("500m", 0.5), ("1.5", 1.5), ("2", 2), (4, 4), ("250m", 0.25)])
+def test_parse_cpu(quantity, cores):
+    assert parse_cpu(quantity) == cores
+
+
+@pytest.mark.parametrize("quantity, size", [
+    ("2Gi", 2 * 2 ** 30), ("512Mi", 512 * 2 ** 20), ("4G", 4 * 10 ** 9), ("1.5", 1), ("1.5Ki", 1536), (1024, 1024),
+])
+def test_parse_memory(quantity, size):
+    assert parse_memory(quantity) == size
+
+
+@pytest.mark.parametrize("quantity", ["", "abc", "-1", "1.5x", "m", "2 cores", "inf", "nan"])
+def test_parse_cpu_rejects_invalid_quantities(quantity):
+    with pytest.raises(ValueError):
+        parse_cpu(quantity)
+
+
+@pytest.mark.parametrize("quantity", ["", "abc", "-1Gi", "2Gb", "Gi", "1e9x", "inf"])
+def test_parse_memory_rejects_invalid_quantities(quantity):
+    with pytest.raises(ValueError):
+        parse_memory(quantity)
+
+
+def test_sized_settings_from_kubernetes_requests():
+    executor_config = {"KubernetesExecutor": {"request_cpu": "2", "request_memory": "8Gi"}}
+
+    assert sized_settings("kubernetes", executor_config) == {
+        "normalize__workers": 2,
+        "data_writer__buffer_max_items": int(8 * 2 ** 30 * BUFFER_MEMORY_SHARE / 2 / BUFFER_BYTES_PER_ITEM),
+    }
+
+
+def test_sized_settings_keep_dlt_defaults():
+    assert sized_settings("default", {"KubernetesExecutor": {"request_cpu": "2"}}) == {}
+    assert sized_settings("kubernetes", {"KubernetesExecutor": {"request_cpu": "500m", "request_memory": "64Mi"}}) == {
+        "normalize__workers": 1,
+        "data_writer__buffer_max_items": DLT_DEFAULT_BUFFER_MAX_ITEMS,
+    }